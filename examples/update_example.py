@@ -35,9 +35,6 @@ class UpdateServer(Service):
             self.l.info('Make sure to configure PSVC\\release_path in psvc.conf')
             self.stop()
 
-    async def run(self):
-        await asyncio.sleep(1)
-
     async def destroy(self):
         self.l.info('Update server shutting down')
         await super().destroy()
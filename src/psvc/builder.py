@@ -1,17 +1,20 @@
 """🚀 빌드 자동화 모듈 - PyInstaller 래퍼 with Style"""
 
 import os
+import re
 import sys
+import collections
 import shutil
 import json
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Dict, Optional, Any
-from dataclasses import dataclass, asdict, field
+from typing import List, Dict, Optional, Any, Tuple
+from dataclasses import dataclass, field, fields
 
 from .utils.version import is_valid_version
-from .utils.checksum import calculate_directory_checksums
+from .utils.checksum import calculate_directory_checksums, compile_patterns, compile_dir_patterns
 
 
 @dataclass
@@ -27,8 +30,13 @@ class BuildMetadata:
     release_notes: str = ''
 
     def to_dict(self) -> dict:
-        """딕셔너리로 변환 (JSON 직렬화용)"""
-        return asdict(self)
+        """
+        딕셔너리로 변환 (JSON 직렬화용)
+
+        asdict()와 달리 files 목록을 깊은 복사하지 않으므로, 반환값의 중첩 값은
+        메타데이터 객체와 공유됩니다.
+        """
+        return {f.name: getattr(self, f.name) for f in fields(self)}
 
 
 class BuildError(Exception):
@@ -50,6 +58,12 @@ class Builder:
 
     # 기본 제외 패턴 - 상수로 관리
     DEFAULT_EXCLUDE = ['*.conf', '*.log', '*.pyc', '__pycache__', '*.pyo']
+    # 아티팩트 복사 스레드 수 - 파일 복사는 시스템 콜 동안 GIL을 놓으므로 병렬로 진행됨
+    COPY_WORKERS = 8
+    # 체크섬 캐시 파일 (릴리스 경로 기준) - 재빌드 시 바뀌지 않은 파일은 다시 해시하지 않음
+    CHECKSUM_CACHE = '.checksum_cache.json'
+    # PyInstaller 실패 시 오류 메시지에 포함할 마지막 출력 줄 수
+    PYINSTALLER_TAIL_LINES = 20
 
     def __init__(
         self,
@@ -92,7 +106,10 @@ class Builder:
         Args:
             version: Semantic version (예: "1.0.0")
             spec_file: PyInstaller spec 파일 경로 (필수)
-            exclude_patterns: 제외할 파일 패턴 (기본값 사용 가능)
+            exclude_patterns: 제외할 파일 이름 패턴 (기본값: DEFAULT_EXCLUDE)
+                '/'와 '.'이 없는 패턴(예: '__pycache__')은 디렉토리 이름에도 적용되어,
+                이름이 맞는 디렉토리는 하위 트리 전체가 복사/체크섬 대상에서 빠집니다.
+                ('*.log' 같은 파일 패턴은 'old.log'라는 디렉토리에는 적용되지 않음)
             **pyinstaller_options: PyInstaller 추가 옵션
 
         Returns:
@@ -117,8 +134,9 @@ class Builder:
         print(f"🚀 Building {self.service_name} v{version}")
         print(f"{'='*70}")
 
-        # 제외 패턴 설정
-        exclude_patterns = exclude_patterns or self.DEFAULT_EXCLUDE
+        # 제외 패턴 설정 (복사/체크섬 단계에서 공유하도록 한 번만 컴파일)
+        exclude_re = compile_patterns(exclude_patterns or self.DEFAULT_EXCLUDE)
+        dir_exclude_re = compile_dir_patterns(exclude_patterns or self.DEFAULT_EXCLUDE)
 
         # 버전 디렉토리 준비
         version_dir = self._prepare_version_dir(version)
@@ -126,9 +144,9 @@ class Builder:
         try:
             # 🔥 빌드 파이프라인 - 각 단계가 명확하게 분리됨
             dist_path = self._run_pyinstaller(spec_file, **pyinstaller_options)
-            self._copy_artifacts(dist_path, version_dir, exclude_patterns)
-            checksums = self._calculate_checksums(version_dir, exclude_patterns)
-            metadata = self._create_metadata(version, version_dir, checksums)
+            self._copy_artifacts(dist_path, version_dir, exclude_re, dir_exclude_re)
+            checksums, sizes = self._calculate_checksums(version_dir, exclude_re, dir_exclude_re)
+            metadata = self._create_metadata(version, checksums, sizes)
             self._save_metadata(version_dir, metadata)
 
             self._print_summary(version_dir, metadata)
@@ -180,37 +198,46 @@ class Builder:
 
         print(f"  Command: {' '.join(cmd)}")
 
-        # PyInstaller 실행
-        result = subprocess.run(
+        # PyInstaller 실행 (출력 전체를 메모리에 모으지 않고 줄 단위로 읽으며 마지막 부분만 보관)
+        tail = collections.deque(maxlen=self.PYINSTALLER_TAIL_LINES)
+        with subprocess.Popen(
             cmd,
             cwd=str(self.root_path),
-            capture_output=True,
-            text=True
-        )
-
-        if result.returncode != 0:
-            error_msg = result.stderr or result.stdout
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors='replace'
+        ) as proc:
+            for line in proc.stdout:
+                tail.append(line.rstrip())
+        returncode = proc.returncode
+
+        if returncode != 0:
+            error_msg = '\n'.join(tail)
             raise BuildError(
-                f"PyInstaller failed (exit {result.returncode})\n{error_msg[:500]}"
+                f"PyInstaller failed (exit {returncode})\n{error_msg}"
             )
 
         # 빌드 결과 찾기
         dist_dir = self.root_path / 'dist'
-        if not dist_dir.exists() or not list(dist_dir.iterdir()):
+        try:
+            outputs = list(dist_dir.iterdir())  # 디렉토리 목록은 한 번만 읽음
+        except FileNotFoundError:
+            outputs = []
+        if not outputs:
             raise BuildError("No output in dist directory")
 
         print(f"  ✓ PyInstaller completed")
-        return list(dist_dir.iterdir())[0]
+        return outputs[0]
 
     def _copy_artifacts(
         self,
         source: Path,
         destination: Path,
-        exclude_patterns: List[str]
+        exclude_re: Optional[re.Pattern],
+        dir_exclude_re: Optional[re.Pattern] = None
     ):
-        """📦 빌드 결과물 복사 (제외 패턴 적용)"""
-        import fnmatch
-
+        """📦 빌드 결과물 복사 (파일은 exclude_re, 디렉토리는 dir_exclude_re로 제외)"""
         print(f"\n[2/5] 📦 Copying build artifacts...")
 
         if source.is_file():
@@ -219,46 +246,123 @@ class Builder:
             print(f"  ✓ {source.name}")
             return
 
-        # 디렉토리 재귀 복사
-        copied = 0
-        for item in source.rglob('*'):
-            if not item.is_file():
-                continue
-
-            # 제외 패턴 체크
-            if any(fnmatch.fnmatch(item.name, p) for p in exclude_patterns):
-                continue
-
-            # 복사 (디렉토리 구조 유지)
-            rel_path = item.relative_to(source)
-            dest_file = destination / rel_path
-            dest_file.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(item, dest_file)
-            copied += 1
-
-        print(f"  ✓ Copied {copied} file(s)")
+        # 디렉토리 재귀 탐색 (os.scandir: DirEntry의 캐시된 타입 정보로 항목마다 stat 하지 않음)
+        # 대상 디렉토리는 탐색하면서 미리 만들고, 파일 복사는 모아서 스레드 풀에서 수행
+        jobs = []
+        stack = [(source, destination)]
+        while stack:
+            src_dir, dest_dir = stack.pop()
+            dest_ready = False
+            with os.scandir(src_dir) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        # 디렉토리 패턴(예: __pycache__)에 맞으면 하위 트리 전체를 탐색하지 않음
+                        if dir_exclude_re is None or not dir_exclude_re.match(os.path.normcase(entry.name)):
+                            stack.append((entry.path, dest_dir / entry.name))
+                        continue
+                    # 심볼릭 링크 디렉토리는 따라가지 않음 (체크섬 계산과 같은 트리를 보도록, 순환 링크 방지)
+                    if not entry.is_file():
+                        continue
+
+                    # 제외 패턴 체크 (패턴 전체를 합친 정규식 한 번)
+                    if exclude_re is not None and exclude_re.match(os.path.normcase(entry.name)):
+                        continue
+
+                    # 디렉토리 구조 유지 (대상 디렉토리는 디렉토리마다 한 번만 생성)
+                    if not dest_ready:
+                        os.makedirs(dest_dir, exist_ok=True)
+                        dest_ready = True
+                    jobs.append((entry.path, dest_dir / entry.name))
+
+        if jobs:
+            with ThreadPoolExecutor(max_workers=min(self.COPY_WORKERS, len(jobs))) as pool:
+                # 결과를 소비해 복사 중 발생한 예외를 그대로 전파
+                for _ in pool.map(_copy_file, *zip(*jobs)):
+                    pass
+
+        print(f"  ✓ Copied {len(jobs)} file(s)")
 
     def _calculate_checksums(
         self,
         version_dir: Path,
-        exclude_patterns: List[str]
-    ) -> Dict[str, str]:
-        """🔐 체크섬 계산 (SHA256)"""
+        exclude_re: Optional[re.Pattern],
+        dir_exclude_re: Optional[re.Pattern] = None
+    ) -> Tuple[Dict[str, str], Dict[str, int]]:
+        """
+        🔐 체크섬 계산 (SHA256)
+
+        Returns:
+            ({상대경로: 체크섬}, {상대경로: 파일 크기}) - 크기는 탐색 중 얻은 값을 재사용
+        """
         print(f"\n[3/5] 🔐 Calculating checksums...")
 
+        # 복사 시 수정 시각이 보존되므로, 같은 버전을 다시 빌드할 때 이전 빌드와
+        # 수정 시각/크기가 같은 파일은 캐시 사용 (다른 버전의 항목은 재사용하지 않음)
+        cache_file = self.release_path / self.CHECKSUM_CACHE
+        version = version_dir.name
+        all_caches = self._load_checksum_cache(cache_file)
+        cached_before = all_caches.get(version, {})
+        cache = dict(cached_before)
+
+        sizes = {}
         checksums = calculate_directory_checksums(
             str(version_dir),
-            exclude_patterns
+            exclude_re,
+            cache,
+            sizes=sizes,
+            dir_exclude_patterns=dir_exclude_re
         )
 
-        print(f"  ✓ {len(checksums)} file(s) processed")
-        return checksums
+        # 이번 빌드에 없는 파일의 항목과 디렉토리가 없어진 버전의 캐시는 버림
+        cache = {rel_path: cache[rel_path] for rel_path in checksums}
+        updated = {
+            v: entries for v, entries in all_caches.items()
+            if v != version and (self.release_path / v).is_dir()
+        }
+        updated[version] = cache
+        if updated != all_caches:
+            self._save_checksum_cache(cache_file, updated)
+
+        reused = sum(1 for rel_path in checksums if cached_before.get(rel_path) == cache[rel_path])
+        print(f"  ✓ {len(checksums)} file(s) processed ({reused} from cache)")
+        return checksums, sizes
+
+    @staticmethod
+    def _load_checksum_cache(cache_file: Path) -> Dict[str, Dict[str, list]]:
+        """체크섬 캐시 읽기 - {버전: {상대경로: [mtime_ns, 크기, 체크섬]}} (없거나 손상되었으면 빈 캐시)"""
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(cache, dict):
+            return {}
+        return {
+            version: {
+                rel_path: entry for rel_path, entry in entries.items()
+                if isinstance(entry, list) and len(entry) == 3
+            }
+            for version, entries in cache.items()
+            if isinstance(entries, dict)
+        }
+
+    @staticmethod
+    def _save_checksum_cache(cache_file: Path, cache: Dict[str, Dict[str, list]]):
+        """체크섬 캐시 저장 (임시 파일에 쓴 뒤 교체하여 중간에 실패해도 손상되지 않음)"""
+        tmp_file = cache_file.with_name(cache_file.name + '.tmp')
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(cache, f)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            # 캐시는 최적화일 뿐이므로 저장 실패가 빌드를 실패시키지 않도록 함
+            print(f"  ⚠️  Failed to save checksum cache: {e}")
 
     def _create_metadata(
         self,
         version: str,
-        version_dir: Path,
-        checksums: Dict[str, str]
+        checksums: Dict[str, str],
+        sizes: Dict[str, int]
     ) -> BuildMetadata:
         """📝 메타데이터 생성 (dataclass 사용으로 타입 안전성 보장)"""
         print(f"\n[4/5] 📝 Creating metadata...")
@@ -266,7 +370,7 @@ class Builder:
         files = [
             {
                 'path': rel_path.replace('\\', '/'),  # Windows 경로 정규화
-                'size': (version_dir / rel_path).stat().st_size,
+                'size': sizes[rel_path],
                 'checksum': checksum
             }
             for rel_path, checksum in checksums.items()
@@ -290,13 +394,26 @@ class Builder:
         """📊 빌드 결과 요약 출력"""
         total_size_mb = sum(f['size'] for f in metadata.files) / 1024 / 1024
 
-        print(f"\n{'='*70}")
-        print(f"✅ Build Completed: {version_dir}")
-        print(f"{'='*70}")
-        print(f"  Version:      {metadata.version}")
-        print(f"  Status:       {metadata.status}")
-        print(f"  Platform:     {metadata.platform}")
-        print(f"  Files:        {len(metadata.files)} file(s)")
-        print(f"  Total size:   {total_size_mb:.2f} MB")
-        print(f"  Build time:   {metadata.build_time}")
-        print(f"{'='*70}\n")
+        print('\n'.join([
+            f"\n{'='*70}",
+            f"✅ Build Completed: {version_dir}",
+            f"{'='*70}",
+            f"  Version:      {metadata.version}",
+            f"  Status:       {metadata.status}",
+            f"  Platform:     {metadata.platform}",
+            f"  Files:        {len(metadata.files)} file(s)",
+            f"  Total size:   {total_size_mb:.2f} MB",
+            f"  Build time:   {metadata.build_time}",
+            f"{'='*70}\n",
+        ]))
+
+
+def _copy_file(src: str, dst: Path):
+    """
+    파일 내용과 메타데이터 복사 (shutil.copy2와 동일한 결과)
+
+    copyfile은 Linux에서 sendfile, macOS에서 fcopyfile, Windows에서 CopyFile2를 사용하므로
+    내용이 파이썬 버퍼를 거치지 않습니다.
+    """
+    shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
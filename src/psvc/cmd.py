@@ -1,4 +1,6 @@
 import asyncio
+import collections
+import contextvars
 import json
 import inspect
 
@@ -72,14 +74,22 @@ def command(_func=None, *, ident=None):
 
 
 class Commander(Component):
-    def __init__(self, svc: Service, name='Commander', parent=None):
+    def __init__(self, svc: Service, name='Commander', parent=None, sndbuf=None, rcvbuf=None):
         super().__init__(svc, name, parent)
-        self._sock = Socket(self.svc, name+'-Sock', parent=self)
+        # sndbuf/rcvbuf: 대용량 파일 전송(업데이트 배포 등)용 소켓 버퍼 크기 (None이면 시스템 기본값)
+        self._sock = Socket(self.svc, name+'-Sock', parent=self, tcp_quickack=True,
+                            sndbuf=sndbuf, rcvbuf=rcvbuf)
         self._en = json.JSONEncoder()
         self._de = json.JSONDecoder()
         self._cmds = {}
         self._handle_lock = asyncio.Lock()
-        self._call_stack = []
+        # 실행 중인 명령 ident 튜플 (태스크마다 따로 유지하여, 다른 태스크에서 실행되는
+        # 명령이 중첩 호출로 잘못 판단되어 _handle_lock 없이 실행되지 않도록 함)
+        self._call_stack = contextvars.ContextVar(name+'-CallStack', default=())
+        # hold(cid) 중이거나 보류 명령을 실행 중인 cid -> 보류된 (ident, body) deque
+        self._held = {}
+        self._holding = set()
+        self._draining = set()
         self._task = self.svc.append_task(asyncio.get_running_loop(), self._receive(), name+'-Res')
         self.l.debug('new Commander attached')
 
@@ -88,8 +98,8 @@ class Commander(Component):
 
     # == Setting ==
 
-    async def bind(self, addr: str, port: int):
-        await self._sock.bind(addr, port)
+    async def bind(self, addr: str, port: int, reuse_port: bool = False, backlog: int = 100):
+        await self._sock.bind(addr, port, reuse_port=reuse_port, backlog=backlog)
 
     async def connect(self, addr: str, port: int):
         """서버에 연결하고 cid 반환"""
@@ -122,30 +132,10 @@ class Commander(Component):
             if not callable(func):
                 raise TypeError('Command must be callable.')
 
-            # 바인딩된 메서드(bound method)인지 확인
-            is_bound_method = inspect.ismethod(func)
-
-            sig = inspect.signature(func)
-            params = list(sig.parameters.values())
-
-            # 파라미터 개수 검증
-            # 바인딩된 메서드는 self가 이미 제외된 상태로 시그니처에 나타남
-            expected_params = 3
-            if not is_bound_method and len(params) > 0 and params[0].name == 'self':
-                # 언바운딩 메서드 (데코레이터 시점)
-                expected_params = 4
-
-            if len(params) != expected_params:
-                raise TypeError(
-                    f"Command function '{func.__name__}' must have {expected_params} parameters, "
-                    f"got {len(params)}"
-                )
-
-            if not inspect.iscoroutinefunction(func):
-                raise TypeError(
-                    f"Command function '{func.__name__}' must be async "
-                    "(use 'async def')."
-                )
+            # @command로 장식된 함수는 데코레이터에서 이미 검증했으므로
+            # inspect.signature 기반 검증을 다시 하지 않음
+            if not getattr(func, '_psvc_command', False):
+                Commander._validate_command(func)
 
             # ident 결정
             if ident is not None:
@@ -160,42 +150,107 @@ class Commander(Component):
             if cur_ident in self._cmds:
                 raise ValueError('Ident is collided. (%s)' % (cur_ident, ))
 
-            # 핸들러 생성
+            # 함수를 그대로 등록 (호출마다 감싸는 코루틴 프레임을 만들지 않음)
             # 바인딩된 메서드는 self가 자동 전달되므로 (cmdr, body, cid)만 전달
             # 일반 함수는 Commander 인스턴스를 cmdr로 전달
-            async def handler(body, cid, _func=func):
-                try:
-                    return await _func(self, body, cid)
-                except Exception as e:
-                    raise
-
-            self._cmds[cur_ident] = handler
+            self._cmds[cur_ident] = func
             registered.append(cur_ident)
 
         return registered[0] if len(registered) == 1 else tuple(registered)
     
+    @staticmethod
+    def _validate_command(func):
+        """@command 없이 등록되는 함수의 시그니처 검증"""
+        # 바인딩된 메서드(bound method)인지 확인
+        is_bound_method = inspect.ismethod(func)
+
+        sig = inspect.signature(func)
+        params = list(sig.parameters.values())
+
+        # 파라미터 개수 검증
+        # 바인딩된 메서드는 self가 이미 제외된 상태로 시그니처에 나타남
+        expected_params = 3
+        if not is_bound_method and len(params) > 0 and params[0].name == 'self':
+            # 언바운딩 메서드 (데코레이터 시점)
+            expected_params = 4
+
+        if len(params) != expected_params:
+            raise TypeError(
+                f"Command function '{func.__name__}' must have {expected_params} parameters, "
+                f"got {len(params)}"
+            )
+
+        if not inspect.iscoroutinefunction(func):
+            raise TypeError(
+                f"Command function '{func.__name__}' must be async "
+                "(use 'async def')."
+            )
+
     @property
     def call_stack(self):
-        return tuple(self._call_stack)
+        return self._call_stack.get()
+
+    def hold(self, cid):
+        """
+        cid에서 받는 명령의 실행을 release(cid)까지 보류
+
+        파일 전송처럼 한 연결로 여러 프레임을 이어서 보내는 동안 같은 연결의 다른 명령이
+        실행되면, 그 응답이 전송 중인 프레임 사이에 끼거나 sendfile 도중 쓰기가 일어납니다.
+        전송을 시작하기 전에 hold 하고, 끝나면 반드시 release 하세요.
+        (명령 핸들러가 아닌 다른 태스크가 같은 cid로 직접 보내는 것은 막지 않음)
+        """
+        if cid in self._holding:
+            raise RuntimeError('Commands from cid=%d are already held' % (cid, ))
+        self._holding.add(cid)
+        self._held.setdefault(cid, collections.deque())
+
+    def release(self, cid):
+        """보류를 해제하고, 보류 중에 받은 명령을 받은 순서대로 실행"""
+        self._holding.discard(cid)
+        held = self._held.get(cid)
+        if held is None or cid in self._draining:
+            return
+        if not held:
+            del self._held[cid]
+            return
+        self._draining.add(cid)
+        self.svc.append_task(asyncio.get_running_loop(), self._run_held(cid, held),
+                             '%s-Held-%d' % (self.name, cid), discard_when_done=True)
+
+    async def _run_held(self, cid, held):
+        # release()를 부른 명령의 호출 스택이 복사되어 있으므로 비우고 시작하여,
+        # 보류 명령도 최상위 호출로서 _handle_lock을 잡고 _receive와 번갈아 실행되도록 함
+        self._call_stack.set(())
+        try:
+            # 실행한 명령이 다시 hold 하면 남은 명령은 그 release 뒤에 이어서 실행
+            while held and cid not in self._holding:
+                ident, body = held.popleft()
+                try:
+                    await self.call(ident, body, cid)
+                except Exception:
+                    self.l.exception('Held command failed: %s (cid=%d)', ident, cid)
+        finally:
+            self._draining.discard(cid)
+            if not held and cid not in self._holding:
+                del self._held[cid]
     
 
     # == Execute ==
 
     async def _execute(self, ident, body, cid):
-        self._call_stack.append(ident)
-        try:
-            handler = self._cmds[ident]
-        except KeyError:
-            self._call_stack.pop()
+        # 명령 테이블은 ident -> 함수의 평탄한 dict이므로 조회 한 번으로 분기
+        handler = self._cmds.get(ident)
+        if handler is None:
             raise KeyError('Command not found: %s' % (ident, ))
-        
+
+        token = self._call_stack.set(self._call_stack.get() + (ident, ))
         try:
-            return await handler(body, cid)
+            return await handler(self, body, cid)
         finally:
-            self._call_stack.pop()
+            self._call_stack.reset(token)
 
     async def call(self, ident, body, cid):
-        if not self._call_stack:
+        if not self._call_stack.get():
             async with self._handle_lock:
                 return await self._execute(ident, body, cid)
         else:
@@ -209,20 +264,33 @@ class Commander(Component):
 
     # == Communication ==
 
+    def encode_command(self, cmd_ident, body) -> bytes:
+        """
+        명령을 전송용 bytes로 인코딩
+
+        같은 응답을 여러 클라이언트에 반복해서 보내는 경우
+        인코딩 결과를 캐시해 두고 send_encoded로 전송할 수 있습니다.
+        """
+        return self._en.encode({'_ident': cmd_ident, '_body': body}).encode()
+
+    async def send_encoded(self, data: bytes, cid):
+        """encode_command로 미리 인코딩한 명령을 그대로 전송"""
+        await self._sock.send(data, cid)
+
     async def send_command(self, cmd_ident, body, cid):
-        cmd_header = {
-            '_ident': cmd_ident,
-            '_body': body,
-        }
-        await self._sock.send_str(self._en.encode(cmd_header), cid)
-       
+        await self._sock.send(self.encode_command(cmd_ident, body), cid)
+
     async def _receive(self):
         try:
             while True:
                 cid, msg = await self._sock.recv()
-                msg = msg.decode()
-                cmd_header = self._de.decode(msg)
-                await self.call_header(cmd_header, cid)
+                cmd_header = self._de.decode(msg.decode())
+                held = self._held.get(cid)
+                if held is not None:
+                    # 보류 중(또는 보류 명령 실행 중)이면 순서를 지키도록 뒤에 쌓음
+                    held.append((cmd_header['_ident'], cmd_header['_body']))
+                    continue
+                await self.call(cmd_header['_ident'], cmd_header['_body'], cid)
         except asyncio.CancelledError:
             pass
         finally:
@@ -12,8 +12,8 @@ class Component:
             self.name = svc.name+'-'+name
             self.l = logging.getLogger(name=self.name)
             self.l: logging.Logger
-            if self.svc._fh:
-                self.l.addHandler(self.svc._fh)
+            if self.svc._log_handler:
+                self.l.addHandler(self.svc._log_handler)
         self._component_index = itertools.count(1)
         self._components = weakref.WeakValueDictionary()
         self._parent_index = None
@@ -1,21 +1,35 @@
 import logging
-from abc import ABC, abstractmethod
-import traceback
+import logging.handlers
+import atexit
+import queue
+from abc import ABC
 import os
 import sys
-import asyncio, aiofiles
+import asyncio
 import signal
 import configparser
 import json
+import weakref
 from pathlib import Path
 
 from .comp import Component
-from .builder import Builder
 
 
 _version_conf = 'PSVC\\version'
 _default_conf_path = 'psvc.conf'
 
+# 실행 중인 로그 리스너 (서비스를 종료 시점까지 붙잡지 않도록 약한 참조로 보관)
+_log_listeners = weakref.WeakSet()
+
+
+@atexit.register
+def _stop_log_listeners():
+    """종료 시 남은 로그 레코드를 모두 기록한 뒤 리스너 정지"""
+    for listener in list(_log_listeners):
+        _log_listeners.discard(listener)
+        listener.stop()
+
+
 class Config(Component):
     def __init__(self, svc, config_file, name='Config'):
         super().__init__(svc, name)
@@ -25,35 +39,62 @@ class Config(Component):
         else:
             self._config_file = self.svc.path(_default_conf_path)
         self._config.read(self._config_file)
+        # 조회용 스냅샷 {section: {key: 원본 값}} (SectionProxy를 조회마다 거치지 않도록)
+        # 보간은 '%'가 들어 있는 값을 조회할 때만 수행하므로, 읽지 않는 키의 보간 오류로
+        # 설정 로드가 실패하지 않음
+        self._values = {}
+        for section in self._config.sections():
+            self._update_values(section)
+
+    def _update_values(self, section: str):
+        """섹션의 조회용 스냅샷 갱신 (DEFAULT가 바뀌면 모든 섹션 갱신)"""
+        if section == self._config.default_section:
+            for s in self._config.sections():
+                self._values[s] = dict(self._config.items(s, raw=True))
+        else:
+            self._values[section] = dict(self._config.items(section, raw=True))
 
     def set_config(self, section: str, key: str, value):
         if section not in self._config:
             self._config.add_section(section)
+        elif self._config.get(section, key, raw=True, fallback=None) == value:
+            return  # 값이 같으면 파일을 다시 쓰지 않음
         self._config.set(section, key, value)
+        self._update_values(section)
         if self._config_file:
-            with open(self._config_file, 'w') as af:
-                self._config.write(af)
+            self._write()
+
+    def _write(self):
+        """설정 파일 저장 (임시 파일에 쓴 뒤 교체하여 중간에 중단돼도 파일이 깨지지 않도록 함)"""
+        tmp_file = os.fspath(self._config_file) + '.tmp'
+        with open(tmp_file, 'w') as af:
+            self._config.write(af)
+        os.replace(tmp_file, self._config_file)
 
     def get_config(self, section: str, key: str, default=None):
         if key is None and '\\' in section:
             section, key = section.split('\\', 1)
-        try:
-            sec = self._config[section]
-        except KeyError:
+        values = self._values.get(section)
+        if values is None:
             if default is None or key is None:
                 raise KeyError('Section is not exist %s\\' % (section))
             else:
                 self.set_config(section, key, default)
                 return default
         if key is None:
-            return sec
-        elif key not in sec:
+            return self._config[section]
+        option = self._config.optionxform(key)
+        value = values.get(option)
+        if value is None:
             if default is None:
                 raise KeyError('Config is not exist %s\\%s' % (section, key))
             else:
                 self.set_config(section, key, default)
                 return default
-        return sec[key]
+        if '%' in value:
+            # 보간이 필요한 값만 ConfigParser를 거침 (BasicInterpolation은 '%'가 없으면 원본과 같음)
+            return self._config.get(section, option)
+        return value
     
 
 class Service(Component, ABC):
@@ -66,6 +107,8 @@ class Service(Component, ABC):
         self._tasks = []
         self._closers = []
         self._fh = None
+        self._log_handler = None  # 서비스/컴포넌트 로거에 붙는 QueueHandler
+        self._log_listener = None
         self.status = None
         self.level = level
         
@@ -78,11 +121,24 @@ class Service(Component, ABC):
 
 # == Setting == 
     
-    def append_task(self, loop:asyncio.AbstractEventLoop, coro, name):
+    def append_task(self, loop:asyncio.AbstractEventLoop, coro, name, discard_when_done=False):
+        """
+        태스크 생성 및 등록 (등록된 태스크는 서비스 종료 시 취소됨)
+
+        Args:
+            discard_when_done: 끝나면 목록에서 제거 (요청마다 생기는 짧은 태스크가
+                서비스가 도는 동안 계속 쌓이지 않도록 할 때 사용)
+        """
         self.l.debug('Append Task - %s', name)
         task = loop.create_task(coro, name=name)
         self._tasks.append(task)
+        if discard_when_done:
+            task.add_done_callback(self._discard_task)
         return task
+
+    def _discard_task(self, task: asyncio.Task):
+        if task in self._tasks:
+            self._tasks.remove(task)
     
     async def delete_task(self, task: asyncio.Task):
         self.l.debug('Delete Task - %s', task.get_name())
@@ -95,7 +151,7 @@ class Service(Component, ABC):
                 await task
             except asyncio.CancelledError:
                 pass
-            self._tasks.remove(task)
+            self._discard_task(task)
 
     def append_closer(self, closer, args: list):
         self._closers.append((closer, args))
@@ -107,13 +163,37 @@ class Service(Component, ABC):
         self.status = status
 
     def set_logger(self, level):
-        self._fh = logging.FileHandler(self.path(self.name+'.log'))
-        self._fh.setLevel(level)
-        self._fh.setFormatter(logging.Formatter(Service._log_format))
+        fh = logging.FileHandler(self.path(self.name+'.log'))
+        fh.setLevel(level)
+        fh.setFormatter(logging.Formatter(Service._log_format))
         logging.basicConfig(level=level, force=True,
                             format=Service._log_format)
         self.l = logging.getLogger(name=self.name)
-        self.l.addHandler(self._fh)
+
+        # 파일 기록은 QueueListener 스레드에서 수행하여 로그 호출이 디스크 쓰기를 기다리지 않도록 함
+        # (종료 시 atexit에서 남은 레코드를 모두 기록한 뒤 정지)
+        if self._log_listener is None:
+            log_queue = queue.SimpleQueue()
+            self._log_handler = logging.handlers.QueueHandler(log_queue)
+            self._log_listener = logging.handlers.QueueListener(log_queue, fh,
+                                                                respect_handler_level=True)
+        else:
+            # 다시 호출되면 로거와 컴포넌트에 붙은 QueueHandler와 큐는 그대로 두고
+            # 남은 레코드를 기록한 뒤 리스너 뒤의 파일 핸들러만 교체
+            self._stop_log_listener()
+            self._fh.close()
+            self._log_listener.handlers = (fh, )
+        self._fh = fh
+        self._log_handler.setLevel(level)
+        self._log_listener.start()
+        _log_listeners.add(self._log_listener)
+        self.l.addHandler(self._log_handler)
+
+    def _stop_log_listener(self):
+        """로그 리스너 정지 (남은 레코드를 모두 기록, 이미 정지했으면 무시)"""
+        if self._log_listener in _log_listeners:
+            _log_listeners.discard(self._log_listener)
+            self._log_listener.stop()
 
     def set_root_path(self, root_file):
         if not os.path.basename(sys.executable).startswith('python'):
@@ -145,7 +225,8 @@ class Service(Component, ABC):
             version: Semantic version (예: "1.0.0")
             spec_file: PyInstaller spec 파일 경로
             release_path: 릴리스 저장 경로 (기본: {root_path}/releases)
-            exclude_patterns: 제외할 파일 패턴 (기본: ['*.conf', '*.log'])
+            exclude_patterns: 제외할 파일 이름 패턴 (기본: Builder.DEFAULT_EXCLUDE).
+                '/'와 '.'이 없는 패턴(예: '__pycache__')에 이름이 맞는 디렉토리는 하위 전체가 제외됩니다.
             **pyinstaller_options: PyInstaller 추가 옵션
 
         Returns:
@@ -158,6 +239,9 @@ class Service(Component, ABC):
         if self._root_path is None:
             raise RuntimeError('Root path is not set. Provide root_file in __init__')
 
+        # 빌드 기능은 개발 환경에서만 쓰이므로 서비스 시작 시가 아니라 사용할 때 import
+        from .builder import Builder
+
         builder = Builder(
             service_name=self.name,
             root_path=self._root_path,
@@ -246,20 +330,24 @@ class Service(Component, ABC):
             print(f"✓ Version {version} has been approved")
             self.l.info('Version %s approved', version)
 
-        # 정보 출력
-        print(f"\n=== Release Information ===")
-        print(f"  Version: {metadata['version']}")
-        print(f"  Status: {metadata['status']}")
-        print(f"  Build time: {metadata['build_time']}")
-        print(f"  Platform: {metadata['platform']}")
-        print(f"  Files: {len(metadata['files'])} files")
-        print(f"  Total size: {sum(f['size'] for f in metadata['files']) / 1024 / 1024:.2f} MB")
+        # 정보 출력 (줄마다 print 하지 않고 한 번에 출력)
+        lines = [
+            f"\n=== Release Information ===",
+            f"  Version: {metadata['version']}",
+            f"  Status: {metadata['status']}",
+            f"  Build time: {metadata['build_time']}",
+            f"  Platform: {metadata['platform']}",
+            f"  Files: {len(metadata['files'])} files",
+            f"  Total size: {sum(f['size'] for f in metadata['files']) / 1024 / 1024:.2f} MB",
+        ]
 
         if metadata.get('release_notes'):
-            print(f"  Release notes: {metadata['release_notes']}")
+            lines.append(f"  Release notes: {metadata['release_notes']}")
 
         if metadata.get('rollback_target'):
-            print(f"  Rollback target: {metadata['rollback_target']}")
+            lines.append(f"  Rollback target: {metadata['rollback_target']}")
+
+        print('\n'.join(lines))
 
         return metadata
 
@@ -347,9 +435,15 @@ class Service(Component, ABC):
 # == Running ==
 
     def on(self):
-        signal.signal(signal.SIGTERM, self.stop)
         self._loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self._loop)
+        # Python 3.8/3.9의 asyncio.Event는 생성 시점의 이벤트 루프에 묶이므로
+        # 서비스 루프에서 다시 생성 (on() 전에 stop()이 호출된 상태는 유지)
+        stopped = self._sigterm.is_set()
+        self._sigterm = asyncio.Event()
+        if stopped:
+            self._sigterm.set()
+        loop_signals = self._set_signal_handler()
 
         self.l.info('PyService Start %s', self)
         self.append_task(self._loop, self._service(), 'ServiceWork')
@@ -361,11 +455,42 @@ class Service(Component, ABC):
             for t in self._tasks:
                 t.cancel()
             self._loop.run_until_complete(asyncio.gather(*self._tasks, return_exceptions=True))
+            for signum in loop_signals:
+                self._loop.remove_signal_handler(signum)
         self._loop.close()
 
         for closer, args in self._closers:
             closer(*args)
 
+    def _set_signal_handler(self):
+        """
+        SIGTERM 수신 시 stop() 호출, SIGINT(Ctrl-C)는 첫 번째에 stop(), 두 번째에 강제 종료
+
+        가능하면 이벤트 루프에 직접 등록해 select 대기 중에도 즉시 깨어나도록 하고,
+        지원하지 않는 환경(Windows 등)에서는 SIGTERM만 signal.signal로 대체합니다.
+        (SIGINT는 기존처럼 KeyboardInterrupt로 처리)
+        메인 스레드가 아니면 시그널 핸들러를 등록하지 않습니다.
+
+        Returns:
+            이벤트 루프에 등록한 시그널 목록
+        """
+        try:
+            self._loop.add_signal_handler(signal.SIGTERM, self.stop)
+            self._loop.add_signal_handler(signal.SIGINT, self._interrupt)
+            return (signal.SIGTERM, signal.SIGINT)
+        except NotImplementedError:
+            signal.signal(signal.SIGTERM, self.stop)
+        except (ValueError, RuntimeError):
+            self.l.debug('Not in main thread, signal handlers are not installed')
+        return ()
+
+    def _interrupt(self):
+        """SIGINT 핸들러: 첫 번째는 정상 종료 요청, 종료 중 다시 들어오면 KeyboardInterrupt"""
+        if self._sigterm.is_set():
+            raise KeyboardInterrupt
+        self.l.info('Stopping by SIGINT')
+        self.stop()
+
     def stop(self, signum=None, frame=None):
         """서비스 중지. signal 핸들러로도 사용 가능"""
         self._sigterm.set()
@@ -378,8 +503,7 @@ class Service(Component, ABC):
             self.l.error('Service Cancelled while initting.')
             self.stop()
         except Exception as e:
-            self.l.error('== Error occurred while initting. ==')
-            self.l.error(traceback.format_exc())
+            self.l.exception('== Error occurred while initting. ==')
             self.stop()
         finally:
             pass
@@ -392,29 +516,32 @@ class Service(Component, ABC):
         except asyncio.CancelledError as c:
             self.l.error('Service Cancelled while running.')
         except Exception as e:
-            self.l.error('== Error occurred while running. ==')
-            self.l.error(traceback.format_exc())
+            self.l.exception('== Error occurred while running. ==')
 
         finally:
             self.set_status('Stopping')
             try:
                 await self.destroy()
             except Exception as e:
-                self.l.error('== Error occurred while destorying. ==')
-                self.l.error(traceback.format_exc())
+                self.l.exception('== Error occurred while destorying. ==')
             self.set_status('Stopped')
 
 # == User Defined == 
 
     async def init(self):
-        await asyncio.sleep(0.1)
+        pass
 
-    @abstractmethod
     async def run(self):
-        pass
+        """
+        실행 단계에서 반복 호출되는 작업
+
+        기본 구현은 stop() 될 때까지 대기만 하므로, 주기적인 폴링 없이
+        명령 처리 등 이벤트로만 동작하는 서비스는 재정의하지 않아도 됩니다.
+        """
+        await self._sigterm.wait()
 
     async def destroy(self):
-        await asyncio.sleep(0.1)
+        pass
 
 # == Repr ==
 
@@ -1,7 +1,9 @@
 import os
+import socket
+import logging
 import asyncio
-import aiofiles
 import itertools
+import collections
 import contextlib
 import struct
 from typing import Tuple
@@ -12,21 +14,46 @@ from .main import Service
 
 class Socket(Component):
     _max_size = 64 * 1024
+    _header = struct.Struct('!I')  # 프레임 길이 헤더 (포맷 문자열 파싱을 매번 하지 않도록 미리 컴파일)
 
-    def __init__(self, svc: Service, name='Socket', parent=None, callback=None, callback_end=None):
+    def __init__(self, svc: Service, name='Socket', parent=None, callback=None, callback_end=None,
+                 tcp_nodelay=True, tcp_quickack=False, sndbuf=None, rcvbuf=None):
         super().__init__(svc, name, parent)
         self._gen = itertools.count(1)
         self._conns = {}
-        self._recvs = {}
+        self._recvs = {}  # cid -> (수신 프레임 deque, 수신 알림 Event)
+        # recv(None)이 모든 연결을 훑지 않도록 수신 프레임이 있는 cid만 도착 순서대로 보관
+        self._ready_cids = collections.deque()
+        self._ready_set = set()
         self._data_available = asyncio.Event()
         self._handle_task = None
-        self._client_cid = None  # 클라이언트 모드에서 사용할 cid
         self.callback = callback
         self.callback_end = callback_end
+        self.tcp_nodelay = tcp_nodelay
+        # TCP_QUICKACK은 Linux 전용이며 수신 후 커널이 해제하므로 매 수신마다 재설정
+        self.tcp_quickack = tcp_quickack and hasattr(socket, 'TCP_QUICKACK')
+        # 커널 송수신 버퍼 크기 (None이면 시스템 기본값/자동 조정 유지)
+        self.sndbuf = sndbuf
+        self.rcvbuf = rcvbuf
         self.l.debug('new Socket attached')
                
-    async def bind(self, addr:str, port:int):
-        self.server = await asyncio.start_server(self._handler, host=addr, port=port)
+    async def bind(self, addr:str, port:int, reuse_port:bool=False, backlog:int=100):
+        """
+        서버 소켓 바인딩
+
+        Args:
+            reuse_port: True면 SO_REUSEPORT 설정 (Linux 등 지원 플랫폼 전용).
+                여러 서비스 프로세스가 같은 포트에 바인딩하면 커널이 accept를 분산합니다.
+            backlog: listen 대기열 크기. 이벤트 루프는 깨어날 때마다 대기 중인 연결을
+                최대 backlog개까지 연속으로 accept하므로, 접속이 몰리는 서버는 크게 설정합니다.
+        """
+        if reuse_port and not hasattr(socket, 'SO_REUSEPORT'):
+            raise ValueError('SO_REUSEPORT is not supported on this platform')
+        self.server = await asyncio.start_server(self._handler, host=addr, port=port,
+                                                 reuse_port=reuse_port or None, backlog=backlog)
+        # 수신 윈도우 스케일은 SYN-ACK 시점의 리슨 소켓 버퍼로 정해지므로 리슨 소켓에도 적용
+        for sock in self.server.sockets:
+            self._set_bufsize(sock)
         addrs = ", ".join(str(sock.getsockname()) for sock in self.server.sockets)
         self.l.debug('Serving on %s', addrs)
         self._handle_task = self.svc.append_task(asyncio.get_running_loop(), self._serv(), self.name)
@@ -47,50 +74,75 @@ class Socket(Component):
     async def connect(self, addr, port):
         """서버에 연결하고 cid 반환"""
         r, w = await asyncio.open_connection(addr, port)
-        # 클라이언트 모드에서는 cid를 미리 할당
-        self._client_cid = next(self._gen)
-        # 핸들러 시작 (내부에서 _add_connection 호출)
+        cid = next(self._gen)
+        # 수신 태스크 시작 전에 연결을 등록하므로 등록 완료를 폴링할 필요가 없음
+        quickack_sock = self._set_sockopt(w)
+        await self._add_connection(cid, r, w)
         self._handle_task = self.svc.append_task(
             asyncio.get_running_loop(),
-            self._handler(r, w),
+            self._receive_loop(cid, r, w, quickack_sock),
             self.name
         )
-        # 연결이 등록될 때까지 대기 (최대 1초)
-        for _ in range(100):
-            if self._client_cid in self._conns:
-                break
-            await asyncio.sleep(0.01)
-        else:
-            raise TimeoutError('Connection not established within timeout')
+        return cid
+
+    def _set_sockopt(self, writer: asyncio.StreamWriter):
+        """
+        연결된 TCP 소켓 옵션 설정 (서버 accept / 클라이언트 connect 공통)
 
-        return self._client_cid
+        Returns:
+            수신마다 TCP_QUICKACK을 재설정해야 하는 소켓 (없으면 None)
+        """
+        sock = writer.get_extra_info('socket')
+        if sock is None or sock.family not in (socket.AF_INET, socket.AF_INET6):
+            return None
+        # 짧은 명령 메시지가 Nagle + delayed ACK로 지연되지 않도록 함
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1 if self.tcp_nodelay else 0)
+        self._set_bufsize(sock)
+        if self.tcp_quickack:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+            return sock
+        return None
+
+    def _set_bufsize(self, sock):
+        """SO_SNDBUF / SO_RCVBUF 설정 (지정한 경우에만)"""
+        if self.sndbuf:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.sndbuf)
+        if self.rcvbuf:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.rcvbuf)
 
     async def _add_connection(self, cid, reader, writer):
         peer = writer.get_extra_info("peername")
         self.l.debug('new connection %s', peer)
         self._conns[cid] = (peer, reader, writer)
-        self._recvs[cid] = asyncio.Queue()
+        # 연결마다 생산자(수신 루프) 하나, 소비자 하나인 구조이므로
+        # asyncio.Queue 대신 deque + Event로 프레임 전달 비용을 줄임
+        self._recvs[cid] = (collections.deque(), asyncio.Event())
         if self.callback:
             await self.callback(cid)
 
     async def _del_connection(self, cid):
         del(self._conns[cid])
-        del(self._recvs[cid])
+        _, ready = self._recvs.pop(cid)
+        ready.set()  # 대기 중인 recv(cid)를 깨워 연결 종료를 알림
         if self.callback_end:
             await self.callback_end(cid)
 
     async def _handler(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
-        # 클라이언트 모드면 미리 할당된 cid 사용, 서버 모드면 새로 생성
-        if self._client_cid is not None:
-            cid = self._client_cid
-        else:
-            cid = next(self._gen)
+        """서버 모드 연결 핸들러"""
+        cid = next(self._gen)
+        quickack_sock = self._set_sockopt(writer)
         await self._add_connection(cid, reader, writer)
+        await self._receive_loop(cid, reader, writer, quickack_sock)
+
+    async def _receive_loop(self, cid, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                            quickack_sock=None):
+        """등록된 연결의 프레임 수신 루프 (연결 종료 시 정리)"""
+        queue, ready = self._recvs[cid]
         try:
             while True:
                 raw = await reader.readexactly(4)
                 try:
-                    (size, ) = struct.unpack('!I', raw)
+                    (size, ) = Socket._header.unpack(raw)
                 except struct.error:
                     raise ValueError('invalid header data')
                 
@@ -98,15 +150,22 @@ class Socket(Component):
                     raise ValueError('invalid header length')
                 
                 buf = await reader.readexactly(size)
-                await self._recvs[cid].put(buf)
+                if quickack_sock is not None:
+                    quickack_sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+                queue.append(buf)
+                ready.set()
+                if cid not in self._ready_set:
+                    self._ready_set.add(cid)
+                    self._ready_cids.append(cid)
                 self._data_available.set()
 
-                buf_debug = buf[0:min(len(buf), 20)]
-                self.l.debug('Receive %s (%d) from %d' % (buf_debug, len(buf), cid))
+                # 프레임마다 호출되므로 DEBUG가 꺼져 있으면 슬라이싱/포맷팅을 하지 않음
+                if self.l.isEnabledFor(logging.DEBUG):
+                    self.l.debug('Receive %s (%d) from %d', buf[:20], len(buf), cid)
         except asyncio.CancelledError:
             pass
         except asyncio.IncompleteReadError:
-            self.l.info('Connection Ended (%d)' % (cid))
+            self.l.info('Connection Ended (%d)', cid)
         finally:
             writer.close()
             await self._del_connection(cid)
@@ -116,34 +175,56 @@ class Socket(Component):
     async def _send(self, msg: bytes, cid: int) -> None:
         _, _, writer = self._conns[cid]
         writer: asyncio.StreamWriter
-        mv = memoryview(msg)
-        i, n = 0, len(mv)
-
-        while i < n:
-            size = min(Socket._max_size, n-i)
-            buf = mv[i:i+size]
-            writer.write(struct.pack('!I', size))
-            writer.write(buf)
+        n = len(msg)
+
+        # 헤더와 본문은 writelines로 함께 넘겨 한 번의 send(2)로 나가도록 함
+        # (Python 3.12+ 에서는 sendmsg로 복사 없이 모아 보냄)
+        if n <= Socket._max_size:
+            # 대부분의 명령 메시지는 한 프레임이므로 memoryview 분할 없이 바로 전송
+            writer.writelines((Socket._header.pack(n), msg))
             await writer.drain()
-            i += size
-        
-        msg_debug = msg[0:min(len(msg), 20)]
-        self.l.debug('Send %s (%d) to %d' % (msg_debug, len(msg), cid))
+        else:
+            mv = memoryview(msg)
+            i = 0
+            while i < n:
+                size = min(Socket._max_size, n-i)
+                writer.writelines((Socket._header.pack(size), mv[i:i+size]))
+                await writer.drain()
+                i += size
+
+        if self.l.isEnabledFor(logging.DEBUG):
+            self.l.debug('Send %s (%d) to %d', msg[:20], len(msg), cid)
 
     async def recv(self, cid=None) -> Tuple[int, bytes]:
         if cid is None:
+            ready_cids = self._ready_cids
             while True:
-                for check_cid, queue in self._recvs.items():
-                    try:
-                        data = queue.get_nowait()
-                        return check_cid, data
-                    except asyncio.QueueEmpty:
+                while ready_cids:
+                    check_cid = ready_cids.popleft()
+                    entry = self._recvs.get(check_cid)
+                    if entry is None or not entry[0]:
+                        # 연결이 끊겼거나 recv(cid)로 이미 소비된 경우
+                        self._ready_set.discard(check_cid)
                         continue
+                    queue = entry[0]
+                    msg = queue.popleft()
+                    if queue:
+                        # 남은 프레임은 다른 연결 뒤로 보내 한 연결이 독점하지 않도록 함
+                        ready_cids.append(check_cid)
+                    else:
+                        self._ready_set.discard(check_cid)
+                    return check_cid, msg
                 self._data_available.clear()
                 await self._data_available.wait()
         else:
-            data = await self._recvs[cid].get()
-            return cid, data
+            entry = self._recvs[cid]
+            queue, ready = entry
+            while not queue:
+                if self._recvs.get(cid) is not entry:
+                    raise ConnectionResetError('Connection closed (%d)' % (cid, ))
+                ready.clear()
+                await ready.wait()
+            return cid, queue.popleft()
 
     async def send(self, msg: bytes, cid: int) -> None:
         if len(msg) <= 0:
@@ -157,32 +238,92 @@ class Socket(Component):
     async def send_str(self, string: str, cid: int) -> None:
         await self.send(string.encode(), cid)
 
-    async def recv_file(self, path: os.PathLike, cid: int) -> None:
+    async def recv_file(self, path: os.PathLike, cid: int, hasher=None) -> int:
+        """
+        파일 수신
+
+        Args:
+            hasher: hashlib 객체를 주면 수신한 청크로 바로 갱신
+                (수신 후 파일을 다시 읽어 체크섬을 계산하지 않아도 됨)
+
+        Returns:
+            기록한 바이트 수
+        """
         try:
             fsize = int(await self.recv_str(cid))
             rsize = 0
-            async with aiofiles.open(path, 'wb') as af:
+            # 프레임(최대 64KB) 단위 쓰기는 페이지 캐시에 바로 반영되므로
+            # 스레드 풀로 넘기지 않고 이벤트 루프에서 직접 기록
+            with open(path, 'wb') as f:
                 while rsize < fsize:
                     _, chunk = await self.recv(cid)
                     rsize += len(chunk)
-                    await af.write(chunk)
+                    f.write(chunk)
+                    if hasher is not None:
+                        hasher.update(chunk)
                     if rsize > fsize:
                         raise Exception('Unmatched file data')
+            return rsize
         except ValueError as ve:
             self.l.error('Value Error')
 
     async def send_file(self, path: os.PathLike, cid: int) -> None:
-        fsize = os.path.getsize(path)
-        await self.send_str(str(fsize), cid)
-        async with aiofiles.open(path, 'rb') as af:
-            while True:
-                chunk = await af.read(self._max_size)
-                if chunk:
-                    await self.send(chunk, cid)
-                else:
-                    break
+        _, _, writer = self._conns[cid]
+        writer: asyncio.StreamWriter
+        loop = asyncio.get_running_loop()
+        with open(path, 'rb') as f:
+            fsize = os.fstat(f.fileno()).st_size
+            await self.send_str(str(fsize), cid)
+            # 헤더와 본문이 나뉘어 작은 세그먼트로 나가지 않도록 전송 동안 TCP_CORK 설정
+            # (명령 메시지용 TCP_NODELAY는 그대로 두고 파일 전송 구간에서만 적용)
+            cork_sock = self._cork(writer)
+            try:
+                offset = 0
+                while offset < fsize:
+                    size = min(Socket._max_size, fsize - offset)
+                    writer.write(Socket._header.pack(size))
+                    # 프레임 본문은 sendfile(2)로 페이지 캐시에서 소켓으로 바로 전송
+                    # (지원하지 않는 환경에서는 asyncio가 read/write 방식으로 대체)
+                    sent = await loop.sendfile(writer.transport, f, offset, size)
+                    if sent != size:
+                        raise ConnectionError('File changed while sending: %s' % (path, ))
+                    offset += size
+            finally:
+                if cork_sock is not None:
+                    # 코르크 해제 시 남은 부분 세그먼트를 즉시 전송
+                    with contextlib.suppress(OSError):
+                        cork_sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 0)
+
+    @staticmethod
+    def _cork(writer: asyncio.StreamWriter):
+        """
+        TCP_CORK 설정 (Linux 전용, 해제는 호출한 쪽에서 수행)
+
+        Returns:
+            설정한 소켓 (지원하지 않거나 TCP 소켓이 아니면 None)
+        """
+        if not hasattr(socket, 'TCP_CORK'):
+            return None
+        sock = writer.get_extra_info('socket')
+        if sock is None or sock.family not in (socket.AF_INET, socket.AF_INET6):
+            return None
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 1)
+        return sock
     
+    async def close(self):
+        """
+        열려 있는 모든 연결 종료
+
+        연결마다 종료를 기다리지 않고 먼저 전부 닫은 뒤 한 번에 대기합니다.
+        """
+        writers = [writer for _, _, writer in self._conns.values()]
+        for writer in writers:
+            writer.close()
+        await asyncio.gather(*(writer.wait_closed() for writer in writers),
+                             return_exceptions=True)
+
     async def detach(self):
         if self._handle_task:
             await self.svc.delete_task(self._handle_task)
         self._handle_task = None
+        await self.close()
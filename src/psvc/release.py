@@ -1,4 +1,6 @@
 import asyncio
+import collections
+import hashlib
 import os
 import sys
 import subprocess
@@ -8,7 +10,7 @@ from .comp import Component
 from .main import Service
 from .cmd import Commander, command
 from .utils.version import compare_versions
-from .utils.checksum import verify_checksum
+from .utils.checksum import parse_checksum
 
 
 class Releaser(Component):
@@ -29,10 +31,13 @@ class Releaser(Component):
             program.exe
     """
     _release_path_conf = 'PSVC\\release_path'
+    _max_concurrent_downloads = 8
 
     def __init__(self, svc: Service, commander: Commander, name='Releaser', parent=None):
         super().__init__(svc, name, parent)
         self._cmdr = commander
+        # 다운로드 전송은 명령 수신 루프와 분리된 태스크에서 클라이언트별로 동시에 진행
+        self._download_slots = asyncio.Semaphore(Releaser._max_concurrent_downloads)
         try:
             self.release_path = self.svc.get_config(Releaser._release_path_conf, None)
         except KeyError:
@@ -41,7 +46,11 @@ class Releaser(Component):
         if not os.path.isdir(self.release_path):
             raise ValueError('Release path does not exist: %s' % self.release_path)
 
-        self.versions = self.get_version_list()
+        self._release_signature = None
+        self._status_cache = {}  # (st_dev, st_ino) -> (st_mtime_ns, st_size, metadata)
+        self._versions_reply = (None, None)  # (signature, 인코딩된 버전 목록 응답)
+        self.versions = []
+        self.refresh_versions()
         self.l.info('Releaser initialized with %d versions: %s', len(self.versions), self.versions)
 
         # 명령어 자동 등록
@@ -63,75 +72,145 @@ class Releaser(Component):
         approved_versions = []
 
         try:
-            for version_dir in os.listdir(self.release_path):
-                dir_path = os.path.join(self.release_path, version_dir)
+            with os.scandir(self.release_path) as it:
+                entries = [entry for entry in it if entry.is_dir()]
+        except OSError as e:
+            self.l.error('Failed to get version list: %s', e)
+            return []
 
-                if not os.path.isdir(dir_path):
-                    continue
+        for entry in entries:
+            version_dir = entry.name
 
-                # status.json 확인
-                status_file = os.path.join(dir_path, 'status.json')
-                if not os.path.exists(status_file):
-                    self.l.warning('No status.json in %s, skipping', version_dir)
-                    continue
+            # status.json 확인 (exists 후 open 하지 않고 바로 열어 확인)
+            # 손상된 버전 하나 때문에 나머지 버전 스캔이 중단되지 않도록 버전별로 처리
+            status_file = os.path.join(entry.path, 'status.json')
+            try:
+                metadata = self._load_status(status_file)
+            except FileNotFoundError:
+                self.l.warning('No status.json in %s, skipping', version_dir)
+                continue
+            except (OSError, ValueError) as e:
+                self.l.warning('Invalid status.json in %s, skipping: %s', version_dir, e)
+                continue
+
+            # approved 상태만 포함 (정렬 키는 수집할 때 한 번만 계산)
+            if metadata.get('status') == 'approved':
+                approved_versions.append((self._version_key(version_dir), version_dir))
+            else:
+                self.l.debug('Version %s status=%s, skipping',
+                            version_dir, metadata.get('status'))
+
+        # Semantic versioning으로 정렬 (미리 계산한 정수 튜플 키 비교)
+        approved_versions.sort()
+        return [version for _, version in approved_versions]
+
+    def _version_key(self, version: str) -> tuple:
+        """
+        버전 정렬 키 (정수 튜플)
 
-                with open(status_file, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
+        형식이 잘못된 버전은 최신 버전으로 선택되지 않도록 가장 앞에 정렬합니다.
+        """
+        try:
+            return (1, tuple(map(int, version.split('.'))))
+        except ValueError:
+            self.l.warning('Version has invalid format: %s', version)
+            return (0, ())
 
-                # approved 상태만 포함
-                if metadata.get('status') == 'approved':
-                    approved_versions.append(version_dir)
-                else:
-                    self.l.debug('Version %s status=%s, skipping',
-                                version_dir, metadata.get('status'))
+    def _scan_signature(self):
+        """
+        릴리스 디렉토리 변경 감지용 시그니처
 
-        except Exception as e:
-            self.l.error('Failed to get version list: %s', e)
+        버전 디렉토리 이름과 각 status.json의 mtime만 stat으로 확인하므로
+        모든 status.json을 열어 파싱하는 get_version_list()보다 가볍다.
+        """
+        signature = []
+        with os.scandir(self.release_path) as it:
+            for entry in it:
+                if not entry.is_dir():
+                    continue
+                try:
+                    mtime = os.stat(os.path.join(entry.path, 'status.json')).st_mtime_ns
+                except OSError:
+                    mtime = None
+                signature.append((entry.name, mtime))
+        return frozenset(signature)
+
+    def refresh_versions(self):
+        """
+        릴리스 디렉토리가 바뀐 경우에만 버전 목록을 다시 스캔
 
-        # Semantic versioning으로 정렬
+        버전 추가/삭제나 status.json 수정(승인, deprecated 처리)이 없으면
+        캐시된 목록을 그대로 반환합니다.
+        """
         try:
-            approved_versions.sort(key=lambda v: tuple(map(int, v.split('.'))))
-        except ValueError as e:
-            self.l.warning('Some versions have invalid format: %s', e)
+            signature = self._scan_signature()
+        except OSError as e:
+            self.l.error('Failed to scan release path: %s', e)
+            return self.versions
 
-        return approved_versions
+        if signature != self._release_signature:
+            self.versions = self.get_version_list()
+            self._release_signature = signature
+        return self.versions
 
     def get_latest_version(self):
-        """최신 버전 반환 (approved 버전 중)"""
-        if not self.versions:
+        """최신 버전 반환 (approved 버전 중, 변경이 없으면 캐시된 목록 사용)"""
+        versions = self.refresh_versions()
+        if not versions:
             return None
-        return self.versions[-1]
+        return versions[-1]
 
     def get_metadata(self, version: str) -> dict:
         """특정 버전의 메타데이터 읽기"""
         status_file = os.path.join(self.release_path, version, 'status.json')
 
-        if not os.path.exists(status_file):
-            raise FileNotFoundError(f'Metadata not found for version {version}')
+        try:
+            return self._load_status(status_file)
+        except FileNotFoundError:
+            raise FileNotFoundError(f'Metadata not found for version {version}') from None
+
+    def _load_status(self, status_file: str) -> dict:
+        """
+        status.json 읽기 (파일 식별자 기준 캐시)
 
+        (st_dev, st_ino)를 키로 mtime_ns와 크기가 그대로면 파싱을 생략합니다.
+        반환된 딕셔너리는 캐시와 공유되므로 수정하지 마세요.
+        """
         with open(status_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+            st = os.fstat(f.fileno())
+            key = (st.st_dev, st.st_ino)
+            cached = self._status_cache.get(key)
+            if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                return cached[2]
+            metadata = json.load(f)
+
+        if not isinstance(metadata, dict):
+            raise ValueError('status.json must contain a JSON object')
+        self._status_cache[key] = (st.st_mtime_ns, st.st_size, metadata)
+        return metadata
 
     def get_program_path(self, version):
         """특정 버전의 프로그램 파일 경로 반환"""
         version_dir = os.path.join(self.release_path, version)
 
+        # 디렉토리는 한 번만 읽고 DirEntry의 캐시된 타입 정보로 파일 여부 판단
+        with os.scandir(version_dir) as it:
+            entries = list(it)
+
         # 실행 파일 찾기 (Windows: .exe, Linux/Mac: 실행 권한 있는 파일)
         if sys.platform == 'win32':
-            for f in os.listdir(version_dir):
-                if f.endswith('.exe'):
-                    return os.path.join(version_dir, f)
+            for entry in entries:
+                if entry.name.endswith('.exe'):
+                    return entry.path
         else:
-            for f in os.listdir(version_dir):
-                fpath = os.path.join(version_dir, f)
-                if os.path.isfile(fpath) and os.access(fpath, os.X_OK):
-                    return fpath
+            for entry in entries:
+                if entry.is_file() and os.access(entry.path, os.X_OK):
+                    return entry.path
 
         # 실행 파일이 없으면 첫 번째 파일 반환
-        files = [f for f in os.listdir(version_dir)
-                if os.path.isfile(os.path.join(version_dir, f))]
-        if files:
-            return os.path.join(version_dir, files[0])
+        for entry in entries:
+            if entry.is_file():
+                return entry.path
 
         raise FileNotFoundError('No program file found in version %s' % version)
 
@@ -139,8 +218,14 @@ class Releaser(Component):
     async def _cmd_request_versions(self, cmdr: Commander, body, cid):
         """클라이언트가 사용 가능한 버전 목록 요청"""
         self.l.info('Version list requested from cid=%d', cid)
-        self.versions = self.get_version_list()  # 최신 목록으로 갱신
-        await cmdr.send_command('__receive_versions__', self.versions, cid)
+        self.refresh_versions()  # 변경이 있을 때만 다시 스캔
+
+        # 버전 목록이 바뀌지 않았으면 이전에 인코딩한 응답을 그대로 전송
+        cached_signature, reply = self._versions_reply
+        if reply is None or cached_signature != self._release_signature:
+            reply = cmdr.encode_command('__receive_versions__', self.versions)
+            self._versions_reply = (self._release_signature, reply)
+        await cmdr.send_encoded(reply, cid)
 
     @command(ident='__request_latest_version__')
     async def _cmd_request_latest_version(self, cmdr: Commander, body, cid):
@@ -155,7 +240,32 @@ class Releaser(Component):
         version = body.get('version')
         self.l.info('Update download requested from cid=%d: version=%s', cid, version)
 
-        if version not in self.versions:
+        # 전송을 별도 태스크로 넘겨 한 클라이언트의 다운로드가 다른 클라이언트의
+        # 명령 처리를 막지 않도록 함. 전송이 끝날 때까지 같은 cid의 명령은 실행을 보류하여
+        # 응답 프레임이 파일 프레임 사이에 끼거나 sendfile 도중 쓰기가 일어나지 않도록 함
+        # (같은 cid의 다음 다운로드 요청도 이 전송이 끝난 뒤 실행됨)
+        cmdr.hold(cid)
+        try:
+            self.svc.append_task(
+                asyncio.get_running_loop(),
+                self._send_update(cmdr, version, cid),
+                '%s-Download-%d' % (self.name, cid),
+                discard_when_done=True
+            )
+        except BaseException:
+            cmdr.release(cid)
+            raise
+
+    async def _send_update(self, cmdr: Commander, version, cid):
+        """업데이트 파일 전송 (동시 전송 수는 _max_concurrent_downloads로 제한)"""
+        try:
+            async with self._download_slots:
+                await self._send_update_files(cmdr, version, cid)
+        finally:
+            cmdr.release(cid)
+
+    async def _send_update_files(self, cmdr: Commander, version, cid):
+        if version not in self.refresh_versions():
             await cmdr.send_command('__download_failed__',
                                    {'error': 'Version not found: %s' % version}, cid)
             return
@@ -182,9 +292,11 @@ class Releaser(Component):
                 'file_count': len(files)
             }, cid)
 
-            # 각 파일 순차 전송
+            # 각 파일 순차 전송 (루프에서 매번 조회하지 않도록 미리 바인딩)
+            version_dir = os.path.join(self.release_path, version)
+            send_file = cmdr.sock().send_file
             for file_info in files:
-                file_path = os.path.join(self.release_path, version, file_info['path'])
+                file_path = os.path.join(version_dir, file_info['path'])
 
                 if not os.path.exists(file_path):
                     raise FileNotFoundError(f"File not found: {file_info['path']}")
@@ -193,7 +305,7 @@ class Releaser(Component):
                             file_info['path'], file_info['size'])
 
                 # 파일 전송
-                await cmdr.sock().send_file(file_path, cid)
+                await send_file(file_path, cid)
 
             # 전송 완료 알림
             await cmdr.send_command('__download_complete__',
@@ -219,6 +331,9 @@ class Updater(Component):
         has_update = await updater.check_update()
         if has_update:
             await updater.download_and_install()
+
+        # 또는 주기적으로 확인 (백그라운드 태스크 하나로 동작)
+        updater.start_auto_update(interval=3600)
     """
     _update_path_conf = 'PSVC\\update_path'
 
@@ -240,21 +355,46 @@ class Updater(Component):
         self._download_status = None
         self._download_error = None
 
-        # 🔒 동기화 이벤트 (blocking 제어용)
-        self._versions_received = asyncio.Event()
-        self._latest_received = asyncio.Event()
-        self._download_completed = asyncio.Event()
+        # 🔒 응답 대기 Future (blocking 제어용)
+        # 응답 종류별로 요청 순서대로 쌓아 두고, 응답 명령 핸들러가 직접 완료시킴
+        # (요청마다 공유 Event를 clear/set 하지 않으므로 동시 요청도 서로 섞이지 않음)
+        self._pending = collections.defaultdict(collections.deque)
+
+        # 자동 업데이트 (주기 확인용 백그라운드 태스크와 주기 변경 알림)
+        self._auto_task = None
+        self._auto_interval = None
+        self._auto_wake = asyncio.Event()
 
         # 다운로드 경로
         self._download_path = self.svc.get_config(Updater._update_path_conf, None, 'updates')
-        full_download_path = self.svc.path(self._download_path)
-        os.makedirs(full_download_path, exist_ok=True)
+        # 절대 경로는 한 번만 계산해 두고 다운로드마다 재사용
+        self._download_dir = os.path.abspath(self.svc.path(self._download_path))
+        os.makedirs(self._download_dir, exist_ok=True)
 
-        self.l.info('Updater initialized, download path: %s', full_download_path)
+        self.l.info('Updater initialized, download path: %s', self._download_dir)
 
         # 명령어 자동 등록
         self._register_commands()
 
+    def _expect(self, kind: str) -> asyncio.Future:
+        """응답 대기용 Future 등록 (요청 전송 전에 호출)"""
+        fut = asyncio.get_running_loop().create_future()
+        self._pending[kind].append(fut)
+        return fut
+
+    def _resolve(self, kind: str, result=None, error: Exception = None):
+        """가장 오래 기다린 요청의 Future 완료 (타임아웃으로 취소된 요청은 건너뜀)"""
+        waiters = self._pending[kind]
+        while waiters:
+            fut = waiters.popleft()
+            if fut.done():
+                continue
+            if error is not None:
+                fut.set_exception(error)
+            else:
+                fut.set_result(result)
+            return
+
     def _register_commands(self):
         """Updater가 받을 명령어들을 Commander에 자동 등록"""
         self._cmdr.set_command(
@@ -274,20 +414,13 @@ class Updater(Component):
         """
         self.l.info('Fetching available versions from server')
 
-        # 이벤트 초기화
-        self._versions_received.clear()
-        self._available_versions = []
-
         # 요청 전송
+        received = self._expect('versions')
         await self._cmdr.send_command('__request_versions__', {}, cid)
 
         # 🔒 응답 대기 (blocking)
         try:
-            await asyncio.wait_for(
-                self._versions_received.wait(),
-                timeout=self._timeout
-            )
-            return self._available_versions
+            return await asyncio.wait_for(received, timeout=self._timeout)
         except asyncio.TimeoutError:
             self.l.error('Timeout waiting for version list (%.1fs)', self._timeout)
             raise TimeoutError(f'No response from server within {self._timeout}s')
@@ -300,20 +433,13 @@ class Updater(Component):
         """
         self.l.info('Fetching latest version from server')
 
-        # 이벤트 초기화
-        self._latest_received.clear()
-        self._latest_version = None
-
         # 요청 전송
+        received = self._expect('latest')
         await self._cmdr.send_command('__request_latest_version__', {}, cid)
 
         # 🔒 응답 대기 (blocking)
         try:
-            await asyncio.wait_for(
-                self._latest_received.wait(),
-                timeout=self._timeout
-            )
-            return self._latest_version
+            return await asyncio.wait_for(received, timeout=self._timeout)
         except asyncio.TimeoutError:
             self.l.error('Timeout waiting for latest version (%.1fs)', self._timeout)
             raise TimeoutError(f'No response from server within {self._timeout}s')
@@ -358,27 +484,19 @@ class Updater(Component):
 
         self.l.info('Requesting download for version %s', version)
 
-        # 이벤트 및 상태 초기화
-        self._download_completed.clear()
-        self._download_status = None
-        self._download_error = None
-
         # 다운로드 요청
+        completed = self._expect('download')
         await self._cmdr.send_command('__download_update__', {'version': version}, cid)
 
-        # 🔒 다운로드 완료 대기 (blocking)
+        # 🔒 다운로드 완료 대기 (blocking, 실패 응답은 RuntimeError로 전달됨)
         try:
-            await asyncio.wait_for(
-                self._download_completed.wait(),
+            status = await asyncio.wait_for(
+                completed,
                 timeout=self._timeout * 3  # 다운로드는 더 긴 타임아웃
             )
 
-            # 에러 체크
-            if self._download_error:
-                raise RuntimeError(f'Download failed: {self._download_error}')
-
-            self.l.info('✓ Download completed: %s', self._download_status)
-            return self._download_status
+            self.l.info('✓ Download completed: %s', status)
+            return status
 
         except asyncio.TimeoutError:
             self.l.error('Timeout waiting for download (%.1fs)', self._timeout * 3)
@@ -402,6 +520,58 @@ class Updater(Component):
 
         return True
 
+    def start_auto_update(self, interval: float, cid=1, restart=True):
+        """
+        주기적인 업데이트 확인 시작
+
+        확인은 백그라운드 태스크 하나가 interval 동안 잠들었다가 수행하므로
+        run()에서 매번 시간을 비교하거나 태스크를 만들 필요가 없습니다.
+        이미 실행 중이면 주기만 바꾸고, 현재 대기를 깨워 새 주기로 다시 대기합니다.
+
+        Args:
+            interval: 확인 주기 (초). 시작 직후 한 번 확인한 뒤 이 간격으로 반복
+            cid: 연결 ID
+            restart: 업데이트를 받은 뒤 서비스를 재시작할지 여부
+        """
+        if interval <= 0:
+            raise ValueError('interval must be positive')
+
+        self._auto_interval = interval
+        if self._auto_task is not None and not self._auto_task.done():
+            self._auto_wake.set()
+            return
+
+        self._auto_task = self.svc.append_task(
+            asyncio.get_running_loop(),
+            self._auto_update_loop(cid, restart),
+            self.name + '-AutoUpdate'
+        )
+
+    async def stop_auto_update(self):
+        """주기적인 업데이트 확인 중지"""
+        task, self._auto_task = self._auto_task, None
+        if task is not None:
+            await self.svc.delete_task(task)
+
+    async def _auto_update_loop(self, cid, restart):
+        wake = self._auto_wake
+        while True:
+            try:
+                if await self.download_and_install(cid, restart=restart):
+                    # 받은 버전은 재시작 전까지 현재 버전으로 반영되지 않으므로 더 확인하지 않음
+                    self.l.info('Auto update finished')
+                    return
+            except Exception:
+                self.l.exception('Auto update check failed')
+
+            # 다음 확인까지 대기 (주기가 바뀌면 깨어나 새 주기로 다시 대기)
+            while True:
+                wake.clear()
+                try:
+                    await asyncio.wait_for(wake.wait(), timeout=self._auto_interval)
+                except asyncio.TimeoutError:
+                    break
+
     def restart_service(self):
         """서비스 재시작"""
         self.l.info('Restarting service for update...')
@@ -424,16 +594,16 @@ class Updater(Component):
         """서버로부터 버전 목록 수신"""
         self._available_versions = body
         self.l.info('Received %d versions: %s', len(body), body)
-        # 🔓 이벤트 설정 (blocking 해제)
-        self._versions_received.set()
+        # 🔓 대기 중인 요청 완료 (blocking 해제)
+        self._resolve('versions', body)
 
     @command(ident='__receive_latest_version__')
     async def _cmd_receive_latest_version(self, cmdr: Commander, body, cid):
         """서버로부터 최신 버전 정보 수신"""
         self._latest_version = body
         self.l.info('Received latest version: %s', body)
-        # 🔓 이벤트 설정 (blocking 해제)
-        self._latest_received.set()
+        # 🔓 대기 중인 요청 완료 (blocking 해제)
+        self._resolve('latest', body)
 
     @command(ident='__download_start__')
     async def _cmd_download_start(self, cmdr: Commander, body, cid):
@@ -446,34 +616,45 @@ class Updater(Component):
         self.l.info('Download starting: version=%s, %d files (%.2f MB)',
                    version, file_count, total_size / 1024 / 1024)
 
-        # 버전 디렉토리 생성
-        version_dir = os.path.join(self.svc.path(self._download_path), version)
+        # 버전 디렉토리 생성 (서버가 보낸 버전/경로가 다운로드 경로 밖을 가리키지 않도록 검증)
+        version_dir = os.path.normpath(os.path.join(self._download_dir, version))
+        if os.path.dirname(version_dir) != self._download_dir:
+            raise ValueError('Invalid version: %s' % (version, ))
+        version_prefix = version_dir + os.sep  # 파일마다 다시 계산하지 않도록 미리 구함
         os.makedirs(version_dir, exist_ok=True)
+        created_dirs = {version_dir}  # 이미 만든 디렉토리는 다시 makedirs 하지 않음
 
         # 각 파일 순차 수신
+        recv_file = cmdr.sock().recv_file
         for file_info in files:
             file_path = file_info['path']
             expected_checksum = file_info['checksum']
             expected_size = file_info['size']
 
-            # 전체 경로 생성
-            full_path = os.path.join(version_dir, file_path)
+            # 전체 경로 생성 ('..'이나 절대 경로로 버전 디렉토리를 벗어나는 경로는 거부)
+            full_path = os.path.normpath(os.path.join(version_dir, file_path))
+            if not full_path.startswith(version_prefix):
+                raise ValueError('Invalid file path: %s' % (file_path, ))
 
-            # 하위 디렉토리 생성
-            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            # 하위 디렉토리 생성 (파일마다가 아니라 디렉토리마다 한 번)
+            parent_dir = os.path.dirname(full_path)
+            if parent_dir not in created_dirs:
+                os.makedirs(parent_dir, exist_ok=True)
+                created_dirs.add(parent_dir)
 
             self.l.debug('Receiving file: %s (%d bytes)', file_path, expected_size)
 
             try:
-                # 파일 수신
-                await cmdr.sock().recv_file(full_path, cid)
+                # 파일 수신 (수신하면서 해시를 계산하므로 검증을 위해 파일을 다시 읽지 않음)
+                algorithm, expected_hash = parse_checksum(expected_checksum)
+                hasher = hashlib.new(algorithm)
+                actual_size = await recv_file(full_path, cid, hasher)
 
                 # 체크섬 검증
-                if not verify_checksum(full_path, expected_checksum):
+                if hasher.hexdigest() != expected_hash:
                     raise ValueError(f'Checksum verification failed for {file_path}')
 
                 # 파일 크기 검증
-                actual_size = os.path.getsize(full_path)
                 if actual_size != expected_size:
                     raise ValueError(
                         f'File size mismatch for {file_path}: '
@@ -501,8 +682,8 @@ class Updater(Component):
         self._download_status = version
         self._download_error = None
 
-        # 🔓 이벤트 설정 (blocking 해제)
-        self._download_completed.set()
+        # 🔓 대기 중인 요청 완료 (blocking 해제)
+        self._resolve('download', version)
 
     @command(ident='__download_failed__')
     async def _cmd_download_failed(self, cmdr: Commander, body, cid):
@@ -514,6 +695,6 @@ class Updater(Component):
         self._download_status = None
         self._download_error = error
 
-        # 🔓 이벤트 설정 (blocking 해제)
-        self._download_completed.set()
+        # 🔓 대기 중인 요청에 실패 전달 (blocking 해제)
+        self._resolve('download', error=RuntimeError(f'Download failed: {error}'))
 
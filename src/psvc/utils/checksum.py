@@ -1,8 +1,15 @@
 """파일 체크섬 계산 유틸리티"""
 
+import fnmatch
 import hashlib
 import os
-from typing import Dict
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+# Python 3.11+: 파일 객체를 직접 받아 고정 버퍼에 readinto 하며 해시 (청크마다 bytes를 만들지 않음)
+_file_digest = getattr(hashlib, 'file_digest', None)
 
 
 def calculate_checksum(file_path: str, algorithm: str = 'sha256') -> str:
@@ -19,12 +26,19 @@ def calculate_checksum(file_path: str, algorithm: str = 'sha256') -> str:
     if not os.path.isfile(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
 
-    hasher = hashlib.new(algorithm)
+    return _hash_file(file_path, algorithm)
+
 
-    # 큰 파일도 처리 가능하도록 청크 단위로 읽기
+def _hash_file(file_path: str, algorithm: str = 'sha256') -> str:
+    """존재가 확인된 파일의 체크섬 계산 (추가 stat 없이 바로 읽기)"""
     with open(file_path, 'rb') as f:
-        while chunk := f.read(65536):  # 64KB 단위
-            hasher.update(chunk)
+        if _file_digest is not None:
+            hasher = _file_digest(f, algorithm)
+        else:
+            # 큰 파일도 처리 가능하도록 청크 단위로 읽기
+            hasher = hashlib.new(algorithm)
+            while chunk := f.read(65536):  # 64KB 단위
+                hasher.update(chunk)
 
     return f"{algorithm}:{hasher.hexdigest()}"
 
@@ -40,50 +54,163 @@ def verify_checksum(file_path: str, expected_checksum: str) -> bool:
     Returns:
         체크섬이 일치하면 True
     """
+    algorithm, _ = parse_checksum(expected_checksum)
+    actual_checksum = calculate_checksum(file_path, algorithm)
+    return actual_checksum == expected_checksum
+
+
+def parse_checksum(checksum: str) -> Tuple[str, str]:
+    """
+    "{algorithm}:{checksum}" 형식의 문자열 분리
+
+    Returns:
+        (algorithm, checksum) 튜플
+    """
     try:
-        algorithm, expected_hash = expected_checksum.split(':', 1)
+        algorithm, hexdigest = checksum.split(':', 1)
     except ValueError:
         raise ValueError(
-            f"Invalid checksum format: '{expected_checksum}'. "
+            f"Invalid checksum format: '{checksum}'. "
             f"Expected format: 'algorithm:hash'"
         )
+    return algorithm, hexdigest
 
-    actual_checksum = calculate_checksum(file_path, algorithm)
-    return actual_checksum == expected_checksum
+
+def compile_patterns(patterns) -> Optional[re.Pattern]:
+    """
+    fnmatch 패턴 목록을 하나의 정규식으로 컴파일 (fnmatch.fnmatch와 같은 대소문자 규칙)
+
+    패턴마다 match를 반복하지 않도록 '|'로 합친 단일 정규식을 반환하며,
+    패턴이 없으면 None을 반환합니다.
+    이미 컴파일된 정규식을 넘기면 그대로 반환합니다.
+    같은 패턴 목록은 빌드마다 다시 변환하지 않도록 캐시합니다.
+    """
+    if isinstance(patterns, re.Pattern):
+        return patterns
+    if not patterns:
+        return None
+    return _compile_pattern_tuple(tuple(patterns))
+
+
+def compile_dir_patterns(patterns) -> Optional[re.Pattern]:
+    """
+    디렉토리 가지치기용 패턴만 골라 컴파일
+
+    '/'와 '.'이 없는 패턴(예: '__pycache__')만 디렉토리 이름에 적용합니다.
+    '*.log' 같은 파일 패턴은 파일에만 적용되므로, 이름이 맞는 디렉토리도 그대로 탐색합니다.
+    컴파일된 정규식은 어떤 패턴인지 알 수 없으므로 None을 반환합니다.
+    """
+    if not patterns or isinstance(patterns, re.Pattern):
+        return None
+    return compile_patterns([p for p in patterns if '/' not in p and '.' not in p])
+
+
+@lru_cache(maxsize=32)
+def _compile_pattern_tuple(patterns: Tuple[str, ...]) -> re.Pattern:
+    return re.compile('|'.join(fnmatch.translate(os.path.normcase(p)) for p in patterns))
 
 
 def calculate_directory_checksums(
     directory: str,
-    exclude_patterns: list = None
+    exclude_patterns: list = None,
+    cache: Optional[dict] = None,
+    max_workers: Optional[int] = None,
+    sizes: Optional[dict] = None,
+    dir_exclude_patterns=None
 ) -> Dict[str, str]:
     """
     디렉토리 내 모든 파일의 체크섬 계산
 
     Args:
         directory: 디렉토리 경로
-        exclude_patterns: 제외할 파일 패턴 리스트 (예: ['*.conf', '*.log'])
+        exclude_patterns: 제외할 파일 이름 패턴 리스트 (예: ['*.conf', '__pycache__'])
+            또는 compile_patterns()로 컴파일한 정규식
+        cache: {상대경로: [st_mtime_ns, st_size, 체크섬]} 딕셔너리.
+            주면 수정 시각과 크기가 같은 파일은 다시 해시하지 않고,
+            새로 계산한 체크섬으로 캐시를 갱신합니다.
+        max_workers: 해시 계산 스레드 수 (None이면 CPU 수 기준 기본값)
+        sizes: 주면 탐색 중 얻은 {상대경로: 파일 크기}를 채움
+            (호출한 쪽에서 파일마다 다시 stat 하지 않아도 됨)
+        dir_exclude_patterns: 하위 트리 전체를 건너뛸 디렉토리 이름 패턴 (또는 컴파일한 정규식).
+            None이면 exclude_patterns 중 '/'와 '.'이 없는 패턴 (compile_dir_patterns 참고)
 
     Returns:
         {상대경로: 체크섬} 딕셔너리
     """
-    import fnmatch
-
-    exclude_patterns = exclude_patterns or []
+    # 패턴을 한 번만 컴파일 (파일마다 fnmatch 내부 캐시를 조회하지 않도록)
+    exclude_re = compile_patterns(exclude_patterns)
+    if dir_exclude_patterns is None:
+        dir_re = compile_dir_patterns(exclude_patterns)
+    else:
+        dir_re = compile_patterns(dir_exclude_patterns)
+    order = []     # 결과 순서 (os.walk와 같은 순서)
     checksums = {}
-
-    for root, dirs, files in os.walk(directory):
-        for filename in files:
-            # 제외 패턴 확인
-            if any(fnmatch.fnmatch(filename, pattern) for pattern in exclude_patterns):
-                continue
-
-            file_path = os.path.join(root, filename)
-            # 상대 경로 계산
-            rel_path = os.path.relpath(file_path, directory)
-
-            try:
-                checksums[rel_path] = calculate_checksum(file_path)
-            except Exception as e:
-                print(f"Warning: Failed to calculate checksum for {rel_path}: {e}")
-
-    return checksums
+    pending = []   # 해시가 필요한 (상대경로, 경로, stat)
+
+    # os.scandir 기반 탐색: DirEntry가 파일 타입을 캐시하므로 파일마다
+    # isfile/getsize 같은 추가 stat 없이 분류 가능 (os.walk와 같은 순서 유지)
+    stack = [(directory, '')]
+    while stack:
+        current, prefix = stack.pop()
+        subdirs = []
+        with os.scandir(current) as it:
+            for entry in it:
+                if entry.is_dir():
+                    # os.walk와 동일하게 심볼릭 링크 디렉토리는 따라가지 않음
+                    # 디렉토리 패턴(예: __pycache__)에 맞으면 하위 트리 전체를 건너뜀
+                    if not entry.is_symlink() and not (
+                            dir_re is not None and dir_re.match(os.path.normcase(entry.name))):
+                        subdirs.append((entry.path, prefix + entry.name + os.sep))
+                    continue
+
+                # 파일 제외 패턴 확인 (패턴 전체를 합친 정규식 한 번)
+                if exclude_re is not None and exclude_re.match(os.path.normcase(entry.name)):
+                    continue
+
+                # 상대 경로 계산 (relpath 대신 누적 prefix 사용)
+                rel_path = prefix + entry.name
+                order.append(rel_path)
+
+                if cache is None and sizes is None:
+                    pending.append((rel_path, entry.path, None))
+                    continue
+
+                try:
+                    st = entry.stat()
+                except OSError as e:
+                    print(f"Warning: Failed to calculate checksum for {rel_path}: {e}")
+                    continue
+                if sizes is not None:
+                    sizes[rel_path] = st.st_size
+                cached = cache.get(rel_path) if cache is not None else None
+                if (cached is not None
+                        and cached[0] == st.st_mtime_ns and cached[1] == st.st_size):
+                    checksums[rel_path] = cached[2]
+                else:
+                    pending.append((rel_path, entry.path, st))
+        stack.extend(reversed(subdirs))
+
+    # 해시 계산은 파일별로 독립적이고 hashlib이 계산 중 GIL을 놓으므로 스레드로 병렬 처리
+    if len(pending) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_try_hash_file, [path for _, path, _ in pending]))
+    else:
+        results = [_try_hash_file(path) for _, path, _ in pending]
+
+    for (rel_path, _, st), (checksum, error) in zip(pending, results):
+        if error is not None:
+            print(f"Warning: Failed to calculate checksum for {rel_path}: {error}")
+            continue
+        checksums[rel_path] = checksum
+        if cache is not None:
+            cache[rel_path] = [st.st_mtime_ns, st.st_size, checksum]
+
+    return {rel_path: checksums[rel_path] for rel_path in order if rel_path in checksums}
+
+
+def _try_hash_file(file_path: str):
+    """스레드 풀용 체크섬 계산 (예외는 (None, 예외)로 반환하여 파일별로 처리)"""
+    try:
+        return _hash_file(file_path), None
+    except Exception as e:
+        return None, e
@@ -1,9 +1,14 @@
 """Semantic versioning 유틸리티"""
 
 import re
+from functools import lru_cache
 from typing import Tuple
 
 
+_VERSION_RE = re.compile(r'^(\d+)\.(\d+)\.(\d+)$')
+
+
+@lru_cache(maxsize=256)
 def parse_version(version_str: str) -> Tuple[int, int, int]:
     """
     Semantic version 문자열을 파싱
@@ -17,8 +22,8 @@ def parse_version(version_str: str) -> Tuple[int, int, int]:
     Raises:
         ValueError: 잘못된 버전 형식
     """
-    pattern = r'^(\d+)\.(\d+)\.(\d+)$'
-    match = re.match(pattern, version_str)
+    # 업데이트 확인마다 같은 버전 문자열이 반복되므로 결과(불변 튜플)를 캐시
+    match = _VERSION_RE.match(version_str)
 
     if not match:
         raise ValueError(
@@ -28,9 +28,6 @@ class Server(Service):
         self.cmdr = Commander(self)
         self.cmdr.set_command(echo_cmd, exit_cmd)
         await self.cmdr.bind('0.0.0.0', 50000)
-    
-    async def run(self):
-        await asyncio.sleep(1)
 
     async def destroy(self):
         self.l.info('Server destroy() called')
@@ -0,0 +1,84 @@
+"""Builder 단위 테스트 (PyInstaller 없이 실행 가능한 단계만)"""
+
+import os
+
+import pytest
+
+from psvc.builder import Builder
+from psvc.utils.checksum import compile_patterns, compile_dir_patterns, calculate_directory_checksums
+
+
+def _copied(destination):
+    return sorted(p.relative_to(destination).as_posix() for p in destination.rglob('*'))
+
+
+def test_copy_artifacts_skips_symlinked_dirs(tmp_path):
+    source = tmp_path / 'dist'
+    (source / 'lib').mkdir(parents=True)
+    (source / 'lib' / 'core.dll').write_bytes(b'core')
+    (source / 'app.exe').write_bytes(b'app')
+    try:
+        os.symlink(source / 'lib', source / 'lib' / 'loop')
+        os.symlink(source / 'lib', source / 'linked')
+    except (OSError, NotImplementedError):
+        pytest.skip('symlinks are not available')
+
+    destination = tmp_path / 'out'
+    destination.mkdir()
+    exclude_re = compile_patterns(Builder.DEFAULT_EXCLUDE)
+    Builder('Tester', str(tmp_path))._copy_artifacts(source, destination, exclude_re)
+
+    # 순환 링크에서 멈추지 않고, 체크섬 계산과 같은 파일 목록을 복사
+    assert _copied(destination) == ['app.exe', 'lib', 'lib/core.dll']
+    assert sorted(p.replace('\\', '/') for p in calculate_directory_checksums(str(source))) \
+        == ['app.exe', 'lib/core.dll']
+
+
+def test_copy_artifacts_prunes_only_dir_patterns(tmp_path):
+    source = tmp_path / 'dist'
+    (source / '__pycache__').mkdir(parents=True)
+    (source / '__pycache__' / 'notes.txt').write_text('skip')
+    (source / 'data.conf').mkdir()
+    (source / 'data.conf' / 'data.bin').write_bytes(b'keep')
+    (source / 'data.conf' / 'local.conf').write_text('skip')
+    (source / 'app.exe').write_bytes(b'app')
+
+    destination = tmp_path / 'out'
+    destination.mkdir()
+    patterns = ['*.conf', '*.log', '__pycache__']
+    Builder('Tester', str(tmp_path))._copy_artifacts(
+        source, destination, compile_patterns(patterns), compile_dir_patterns(patterns))
+
+    # '__pycache__' 같은 디렉토리 패턴만 하위 트리를 통째로 제외하고,
+    # '*.conf' 같은 파일 패턴은 이름이 맞는 디렉토리 안의 파일까지 지우지 않음
+    assert _copied(destination) == ['app.exe', 'data.conf', 'data.conf/data.bin']
+
+
+def test_checksum_cache_is_scoped_to_version(tmp_path, capsys):
+    source = tmp_path / 'dist'
+    source.mkdir()
+    app = source / 'app.exe'
+    app.write_bytes(b'version-a')
+    builder = Builder('Tester', str(tmp_path), str(tmp_path / 'releases'))
+    exclude_re = compile_patterns(Builder.DEFAULT_EXCLUDE)
+
+    def build(version):
+        version_dir = builder._prepare_version_dir(version)
+        builder._copy_artifacts(source, version_dir, exclude_re)
+        checksums, _ = builder._calculate_checksums(version_dir, exclude_re)
+        return checksums['app.exe']
+
+    first = build('1.0.0')
+
+    # 크기와 수정 시각이 같아도 다른 버전의 캐시는 쓰지 않음
+    st = app.stat()
+    app.write_bytes(b'version-b')
+    os.utime(app, ns=(st.st_atime_ns, st.st_mtime_ns))
+    second = build('1.0.1')
+    assert second != first
+    assert second == calculate_directory_checksums(str(source))['app.exe']
+
+    # 같은 버전을 다시 빌드하면 캐시 사용
+    capsys.readouterr()
+    assert build('1.0.1') == second
+    assert '(1 from cache)' in capsys.readouterr().out
@@ -0,0 +1,99 @@
+"""체크섬 유틸리티 단위 테스트"""
+
+import hashlib
+
+from psvc.utils.checksum import (
+    calculate_checksum,
+    verify_checksum,
+    calculate_directory_checksums,
+    compile_patterns,
+)
+
+
+def _make_tree(root):
+    (root / 'app.exe').write_bytes(b'binary')
+    (root / 'psvc.conf').write_text('[PSVC]\n')
+    (root / 'lib').mkdir()
+    (root / 'lib' / 'core.dll').write_bytes(b'x' * 100000)
+    (root / 'lib' / 'debug.log').write_text('log')
+    (root / 'lib' / '__pycache__').mkdir()
+    (root / 'lib' / '__pycache__' / 'mod.pyc').write_bytes(b'pyc')
+
+
+def test_calculate_checksum(tmp_path):
+    path = tmp_path / 'data.bin'
+    path.write_bytes(b'hello' * 50000)
+
+    expected = 'sha256:' + hashlib.sha256(b'hello' * 50000).hexdigest()
+    assert calculate_checksum(str(path)) == expected
+    assert verify_checksum(str(path), expected)
+    assert not verify_checksum(str(path), 'sha256:' + '0' * 64)
+
+
+def test_directory_checksums_exclude(tmp_path):
+    _make_tree(tmp_path)
+
+    sizes = {}
+    checksums = calculate_directory_checksums(str(tmp_path), ['*.conf', '*.log', '*.pyc'],
+                                              sizes=sizes)
+    paths = {p.replace('\\', '/') for p in checksums}
+
+    assert paths == {'app.exe', 'lib/core.dll'}
+    assert checksums['app.exe'] == calculate_checksum(str(tmp_path / 'app.exe'))
+    assert sizes.keys() == checksums.keys()
+    assert sizes['app.exe'] == len(b'binary')
+
+
+def test_directory_checksums_prunes_excluded_dirs(tmp_path):
+    _make_tree(tmp_path)
+    (tmp_path / 'lib' / '__pycache__' / 'notes.txt').write_text('skip')
+
+    checksums = calculate_directory_checksums(str(tmp_path), ['*.conf', '*.log', '__pycache__'])
+    paths = {p.replace('\\', '/') for p in checksums}
+
+    assert paths == {'app.exe', 'lib/core.dll'}
+
+
+def test_directory_checksums_keeps_dirs_matching_file_patterns(tmp_path):
+    _make_tree(tmp_path)
+    (tmp_path / 'data.conf').mkdir()
+    (tmp_path / 'data.conf' / 'data.bin').write_bytes(b'keep')
+
+    checksums = calculate_directory_checksums(str(tmp_path), ['*.conf', '*.log', '__pycache__'])
+    paths = {p.replace('\\', '/') for p in checksums}
+
+    # 파일 패턴은 디렉토리에 적용하지 않으므로 'data.conf/' 안의 파일도 체크섬 대상
+    assert paths == {'app.exe', 'lib/core.dll', 'data.conf/data.bin'}
+
+
+def test_directory_checksums_compiled_patterns(tmp_path):
+    _make_tree(tmp_path)
+
+    patterns = ['*.conf', '*.log', '*.pyc']
+    exclude_re = compile_patterns(patterns)
+
+    assert compile_patterns(exclude_re) is exclude_re
+    assert compile_patterns(list(patterns)) is exclude_re
+    assert compile_patterns([]) is None
+    assert (calculate_directory_checksums(str(tmp_path), exclude_re)
+            == calculate_directory_checksums(str(tmp_path), patterns))
+
+
+def test_directory_checksums_cache(tmp_path):
+    _make_tree(tmp_path)
+    patterns = ['*.conf', '*.log', '*.pyc']
+
+    cache = {}
+    checksums = calculate_directory_checksums(str(tmp_path), patterns, cache)
+    assert {p: entry[2] for p, entry in cache.items()} == checksums
+
+    # 수정 시각과 크기가 같으면 캐시된 값을 그대로 사용
+    rel_path = next(p for p in cache if p.endswith('core.dll'))
+    cache[rel_path][2] = 'sha256:cached'
+    assert calculate_directory_checksums(str(tmp_path), patterns, cache)[rel_path] == 'sha256:cached'
+
+    # 내용이 바뀌면 다시 계산
+    (tmp_path / 'lib' / 'core.dll').write_bytes(b'y' * 10)
+    recalculated = calculate_directory_checksums(str(tmp_path), patterns, cache)
+    assert recalculated[rel_path] == calculate_checksum(str(tmp_path / 'lib' / 'core.dll'))
+    assert cache[rel_path][2] == recalculated[rel_path]
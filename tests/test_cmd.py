@@ -0,0 +1,63 @@
+"""Commander 단위 테스트"""
+
+import asyncio
+
+from psvc import Service, Commander
+
+
+class CommandService(Service):
+    pass
+
+
+def test_released_commands_wait_for_running_command(tmp_path):
+    svc = CommandService('CommandTester', str(tmp_path / 'app.py'))
+
+    async def scenario():
+        server = Commander(svc, 'Server')
+        await server.bind('127.0.0.1', 0)
+        port = server.sock().server.sockets[0].getsockname()[1]
+        log = []
+        cids = []
+        joined, slow_started, gate, fast_done = (asyncio.Event() for _ in range(4))
+
+        async def join(cmdr, body, cid):
+            cids.append(cid)
+            joined.set()
+
+        async def slow(cmdr, body, cid):
+            log.append(('slow', cmdr.call_stack))
+            slow_started.set()
+            await gate.wait()
+
+        async def fast(cmdr, body, cid):
+            log.append(('fast', cmdr.call_stack))
+            fast_done.set()
+
+        server.set_command(join, slow, fast)
+
+        held_client = Commander(svc, 'HeldClient')
+        held_cid = await held_client.connect('127.0.0.1', port)
+        await held_client.send_command('join', {}, held_cid)
+        await asyncio.wait_for(joined.wait(), 5)
+
+        # 보류 중에 받은 명령은 다른 연결의 명령이 실행 중이면 그 명령이 끝난 뒤 실행됨
+        server.hold(cids[0])
+        await held_client.send_command('fast', {}, held_cid)
+        other_client = Commander(svc, 'OtherClient')
+        other_cid = await other_client.connect('127.0.0.1', port)
+        await other_client.send_command('slow', {}, other_cid)
+        await asyncio.wait_for(slow_started.wait(), 5)
+
+        server.release(cids[0])
+        await asyncio.sleep(0.1)
+        assert not fast_done.is_set()
+        gate.set()
+        await asyncio.wait_for(fast_done.wait(), 5)
+        await asyncio.sleep(0)
+        # 보류 명령을 실행한 태스크는 끝나면 서비스 태스크 목록에서 빠짐
+        held_tasks = [t for t in svc._tasks if t.get_name().startswith('Server-Held')]
+        return log, held_tasks
+
+    log, held_tasks = asyncio.run(scenario())
+    assert log == [('slow', ('slow', )), ('fast', ('fast', ))]
+    assert held_tasks == []
@@ -0,0 +1,78 @@
+"""Config 단위 테스트"""
+
+import configparser
+
+import pytest
+
+from psvc import Service
+
+
+class ConfigService(Service):
+    pass
+
+
+def _make_service(tmp_path):
+    (tmp_path / 'psvc.conf').write_text('[PSVC]\nversion = 1.2\n\n[Net]\nPort = 50000\n')
+    return ConfigService('ConfigTester', str(tmp_path / 'app.py'))
+
+
+def test_get_config(tmp_path):
+    svc = _make_service(tmp_path)
+
+    assert svc.version == '1.2'
+    assert svc.get_config('Net', 'port') == '50000'
+    assert svc.get_config('Net\\Port', None) == '50000'
+    with pytest.raises(KeyError):
+        svc.get_config('Net', 'host')
+    with pytest.raises(KeyError):
+        svc.get_config('Missing', 'key')
+
+
+def test_set_config_updates_lookup_and_file(tmp_path):
+    svc = _make_service(tmp_path)
+
+    svc.set_config('Net', 'port', '50001')
+    assert svc.get_config('Net', 'port') == '50001'
+    assert svc.get_config('New', 'key', 'value') == 'value'
+
+    parser = configparser.ConfigParser()
+    parser.read(tmp_path / 'psvc.conf')
+    assert parser['Net']['port'] == '50001'
+    assert parser['New']['key'] == 'value'
+    assert not (tmp_path / 'psvc.conf.tmp').exists()
+
+
+def test_interpolation_is_lazy(tmp_path):
+    (tmp_path / 'psvc.conf').write_text(
+        '[PSVC]\nversion = 1.2\nhome = /srv\nlogs = %(home)s/logs\n\n'
+        '[Secret]\npassword = 50%off\n'
+    )
+    svc = ConfigService('ConfigTester', str(tmp_path / 'app.py'))
+
+    # 잘못된 '%'가 있는 키는 조회할 때만 오류
+    assert svc.get_config('PSVC', 'logs') == '/srv/logs'
+    with pytest.raises(configparser.InterpolationSyntaxError):
+        svc.get_config('Secret', 'password')
+
+
+def test_set_config_skips_unchanged_value(tmp_path):
+    svc = _make_service(tmp_path)
+    conf = tmp_path / 'psvc.conf'
+    conf.write_text('# untouched\n' + conf.read_text())
+
+    svc.set_config('Net', 'port', '50000')
+    assert conf.read_text().startswith('# untouched')
+
+
+def test_set_config_with_path_config_file(tmp_path):
+    conf = tmp_path / 'conf' / 'app.conf'
+    conf.parent.mkdir()
+    conf.write_text('[PSVC]\nversion = 1.2\n')
+    svc = ConfigService('ConfigTester', str(tmp_path / 'app.py'), config_file=conf)
+
+    # pathlib.Path로 준 설정 파일에도 저장됨
+    svc.set_config('Net', 'port', '50001')
+    parser = configparser.ConfigParser()
+    parser.read(conf)
+    assert parser['Net']['port'] == '50001'
+    assert sorted(p.name for p in conf.parent.iterdir()) == ['app.conf']
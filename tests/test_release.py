@@ -0,0 +1,224 @@
+"""Releaser / Updater 단위 테스트"""
+
+import asyncio
+import hashlib
+import json
+import os
+
+import pytest
+
+from psvc import Service, Commander
+from psvc.release import Releaser, Updater
+
+
+class ReleaseService(Service):
+    pass
+
+
+def _make_service(tmp_path, version='1.0.0'):
+    release_path = tmp_path / 'releases'
+    release_path.mkdir()
+    (tmp_path / 'psvc.conf').write_text(
+        '[PSVC]\nversion = %s\nrelease_path = %s\nupdate_path = updates\n'
+        % (version, release_path.as_posix())
+    )
+    return ReleaseService('ReleaseTester', str(tmp_path / 'app.py')), release_path
+
+
+def _write_status(release_path, version, data):
+    version_dir = release_path / version
+    version_dir.mkdir()
+    (version_dir / 'status.json').write_text(json.dumps(data))
+
+
+def test_version_list_skips_invalid_status(tmp_path):
+    svc, release_path = _make_service(tmp_path)
+    _write_status(release_path, '1.0.0', {'status': 'approved'})
+    _write_status(release_path, '1.1.0', ['approved'])
+    _write_status(release_path, '1.2.0', 'approved')
+    _write_status(release_path, '0.9.0', {'status': 'draft'})
+
+    async def scenario():
+        releaser = Releaser(svc, Commander(svc, 'Cmdr'))
+        return releaser.versions, releaser.get_latest_version()
+
+    assert asyncio.run(scenario()) == (['1.0.0'], '1.0.0')
+
+
+def _write_release(release_path, version, payload):
+    version_dir = release_path / version
+    version_dir.mkdir()
+    (version_dir / 'app.bin').write_bytes(payload)
+    checksum = 'sha256:' + hashlib.sha256(payload).hexdigest()
+    (version_dir / 'status.json').write_text(json.dumps({
+        'version': version,
+        'status': 'approved',
+        'files': [{'path': 'app.bin', 'size': len(payload), 'checksum': checksum}],
+    }))
+
+
+async def _connect(svc):
+    server = Commander(svc, 'Server')
+    await server.bind('127.0.0.1', 0)
+    releaser = Releaser(svc, server)
+    port = server.sock().server.sockets[0].getsockname()[1]
+
+    client = Commander(svc, 'Client')
+    cid = await client.connect('127.0.0.1', port)
+    updater = Updater(svc, client, timeout=10)
+    return releaser, updater, cid
+
+
+def test_commands_during_download_wait_for_transfer(tmp_path):
+    svc, release_path = _make_service(tmp_path)
+    payload = os.urandom(1024 * 1024)
+    _write_release(release_path, '1.1.0', payload)
+    received = tmp_path / 'updates' / '1.1.0' / 'app.bin'
+
+    async def scenario():
+        releaser, updater, cid = await _connect(svc)
+        # 서버의 파일 전송을 멈춰 두고 그 사이에 같은 연결로 다른 요청을 보냄
+        sock = releaser._cmdr.sock()
+        send_file = sock.send_file
+        started, gate = asyncio.Event(), asyncio.Event()
+
+        async def gated_send_file(path, cid):
+            started.set()
+            await gate.wait()
+            await send_file(path, cid)
+        sock.send_file = gated_send_file
+
+        download = asyncio.ensure_future(updater.download_update('1.1.0', cid))
+        await started.wait()
+        latest = asyncio.ensure_future(updater.fetch_latest_version(cid))
+        await asyncio.sleep(0.2)
+        # 응답이 파일 프레임보다 먼저 나가지 않고 전송이 끝날 때까지 보류됨
+        assert not latest.done()
+        gate.set()
+        result = await asyncio.gather(download, latest)
+        await asyncio.sleep(0.1)
+        # 전송 태스크와 보류 명령 태스크는 끝나면 서비스 태스크 목록에서 빠짐
+        assert [t for t in svc._tasks if '-Download-' in t.get_name()
+                or '-Held-' in t.get_name()] == []
+        return result
+
+    status, latest = asyncio.run(scenario())
+    assert status == '1.1.0'
+    assert latest == '1.1.0'
+    assert received.read_bytes() == payload
+
+
+def test_pipelined_requests_resolve_in_order(tmp_path):
+    svc, release_path = _make_service(tmp_path)
+    _write_status(release_path, '1.0.0', {'status': 'approved'})
+    _write_status(release_path, '1.1.0', {'status': 'approved'})
+
+    async def scenario():
+        _, updater, cid = await _connect(svc)
+        # 응답을 기다리지 않고 연속으로 보낸 요청도 종류별로 보낸 순서대로 짝지어짐
+        received = asyncio.gather(updater._expect('versions'), updater._expect('latest'),
+                                  updater._expect('latest'))
+        for ident in ('__request_latest_version__', '__request_versions__',
+                      '__request_latest_version__'):
+            await updater._cmdr.send_command(ident, {}, cid)
+        return await asyncio.wait_for(received, timeout=5)
+
+    assert asyncio.run(scenario()) == [['1.0.0', '1.1.0'], '1.1.0', '1.1.0']
+
+
+def _files_outside(root, download_dir):
+    return sorted(p for p in root.rglob('*') if download_dir not in p.parents and p != download_dir)
+
+
+@pytest.mark.parametrize('version, file_path', [
+    ('../x', 'app.bin'),
+    ('{outside}', 'app.bin'),
+    ('1.1.0/../../x', 'app.bin'),
+    ('1.1.0', '../x'),
+    ('1.1.0', '{outside}/app.bin'),
+    ('1.1.0', 'lib/../../../x'),
+])
+def test_download_start_rejects_paths_outside_download_dir(tmp_path, version, file_path):
+    svc, _ = _make_service(tmp_path)
+    outside = (tmp_path / 'outside').as_posix()
+    version = version.format(outside=outside)
+    file_path = file_path.format(outside=outside)
+
+    async def scenario():
+        updater = Updater(svc, Commander(svc, 'Client'))
+        download_dir = tmp_path / 'updates'
+        before = _files_outside(tmp_path, download_dir)
+        body = {
+            'version': version,
+            'files': [{'path': file_path, 'size': 1, 'checksum': 'sha256:' + '0' * 64}],
+            'total_size': 1,
+            'file_count': 1,
+        }
+        # 서버가 보낸 버전/파일 경로가 다운로드 경로를 벗어나면 아무것도 쓰지 않고 거부
+        with pytest.raises(ValueError):
+            await updater._cmd_download_start(updater._cmdr, body, 1)
+        return before, _files_outside(tmp_path, download_dir)
+
+    before, after = asyncio.run(scenario())
+    assert after == before
+    assert not (tmp_path / 'x').exists()
+    assert not (tmp_path / 'outside').exists()
+
+
+def _fake_checks(updater, results):
+    """download_and_install 대신 results를 차례로 돌려주고 호출을 기록"""
+    calls = []
+    called = asyncio.Event()
+
+    async def download_and_install(cid, restart=True):
+        calls.append((cid, restart))
+        called.set()
+        result = results.pop(0) if results else False
+        if isinstance(result, Exception):
+            raise result
+        return result
+    updater.download_and_install = download_and_install
+    return calls, called
+
+
+def test_auto_update_retries_failures_and_stops_after_install(tmp_path):
+    svc, _ = _make_service(tmp_path)
+
+    async def scenario():
+        updater = Updater(svc, Commander(svc, 'Client'))
+        calls, called = _fake_checks(updater, [ConnectionError('down'), False, True])
+        updater.start_auto_update(0.05, cid=3, restart=False)
+        # 첫 확인은 주기를 기다리지 않고 바로 수행
+        await asyncio.wait_for(called.wait(), timeout=0.04)
+        # 실패한 확인 뒤에도 계속 확인하고, 설치하면 멈춤
+        await asyncio.wait_for(updater._auto_task, timeout=5)
+        await asyncio.sleep(0.15)
+        return calls
+
+    assert asyncio.run(scenario()) == [(3, False)] * 3
+
+
+def test_auto_update_rearms_interval_and_stops(tmp_path):
+    svc, _ = _make_service(tmp_path)
+
+    async def scenario():
+        updater = Updater(svc, Commander(svc, 'Client'))
+        calls, called = _fake_checks(updater, [])
+        updater.start_auto_update(60)
+        await asyncio.wait_for(called.wait(), timeout=5)
+        task = updater._auto_task
+
+        # 실행 중에 다시 시작하면 태스크는 그대로 두고 새 주기로 다시 대기
+        called.clear()
+        updater.start_auto_update(0.05)
+        assert updater._auto_task is task
+        await asyncio.wait_for(called.wait(), timeout=5)
+        assert len(calls) == 2
+
+        await updater.stop_auto_update()
+        assert updater._auto_task is None
+        assert task.cancelled()
+        await asyncio.sleep(0.15)
+        return calls
+
+    assert len(asyncio.run(scenario())) == 2
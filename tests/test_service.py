@@ -0,0 +1,41 @@
+"""Service 로깅 단위 테스트"""
+
+import gc
+import logging
+import weakref
+
+from psvc import Service
+from psvc.comp import Component
+
+
+class LogService(Service):
+    pass
+
+
+def _queue_handlers(logger):
+    return [h for h in logger.handlers if isinstance(h, logging.handlers.QueueHandler)]
+
+
+def test_set_logger_again_reuses_queue_handler(tmp_path):
+    svc = LogService('LogTester', str(tmp_path / 'app.py'))
+    comp = Component(svc, 'Comp')
+    handler = svc._log_handler
+
+    svc.set_logger(logging.INFO)
+    # 다시 호출해도 로거와 컴포넌트에는 처음의 QueueHandler 하나만 붙어 있음
+    assert _queue_handlers(svc.l) == [handler]
+    assert _queue_handlers(comp.l) == [handler]
+
+    comp.l.info('after set_logger')
+    svc._stop_log_listener()
+    assert 'after set_logger' in (tmp_path / 'LogTester.log').read_text()
+
+
+def test_service_is_not_kept_alive_by_log_listener(tmp_path):
+    svc = LogService('LogReleaseTester', str(tmp_path / 'app.py'))
+    ref = weakref.ref(svc)
+
+    # 리스너는 종료 시 atexit에서 정지하지만, 서비스 자체를 붙잡지는 않음
+    del svc
+    gc.collect()
+    assert ref() is None
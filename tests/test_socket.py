@@ -0,0 +1,68 @@
+"""Socket 단위 테스트"""
+
+import asyncio
+
+from psvc import Service
+from psvc.network import Socket
+
+
+class SocketService(Service):
+    pass
+
+
+async def _recv_all(server, count):
+    return [await asyncio.wait_for(server.recv(), 5) for _ in range(count)]
+
+
+def test_recv_any_connection(tmp_path):
+    svc = SocketService('SocketTester', str(tmp_path / 'app.py'))
+
+    async def scenario():
+        server = Socket(svc, 'Server')
+        await server.bind('127.0.0.1', 0)
+        port = server.server.sockets[0].getsockname()[1]
+
+        clients = [Socket(svc, 'Client%d' % i) for i in range(2)]
+        cids = [await c.connect('127.0.0.1', port) for c in clients]
+        for i, (client, cid) in enumerate(zip(clients, cids)):
+            await client.send(b'first-%d' % i, cid)
+            await client.send(b'second-%d' % i, cid)
+
+        received = await _recv_all(server, 4)
+        for client in clients:
+            await client.close()
+        await server.close()
+        return received
+
+    received = asyncio.run(scenario())
+
+    # 연결별 순서는 유지되고, 모든 연결의 프레임을 빠짐없이 받음
+    by_cid = {}
+    for cid, msg in received:
+        by_cid.setdefault(cid, []).append(msg)
+    assert sorted(by_cid.values()) == [[b'first-0', b'second-0'], [b'first-1', b'second-1']]
+
+
+def test_recv_any_skips_frames_consumed_by_cid(tmp_path):
+    svc = SocketService('SocketTester', str(tmp_path / 'app.py'))
+
+    async def scenario():
+        server = Socket(svc, 'Server')
+        await server.bind('127.0.0.1', 0)
+        port = server.server.sockets[0].getsockname()[1]
+
+        client = Socket(svc, 'Client')
+        cid = await client.connect('127.0.0.1', port)
+        await client.send(b'one', cid)
+        server_cid, first = await asyncio.wait_for(server.recv(), 5)
+        await client.send(b'two', cid)
+        await client.send(b'three', cid)
+
+        # 특정 연결에서 직접 받은 프레임은 recv(None)에서 다시 나오지 않음
+        second = (await asyncio.wait_for(server.recv(server_cid), 5))[1]
+        third = (await asyncio.wait_for(server.recv(), 5))[1]
+        await client.close()
+        await server.close()
+        return first, second, third
+
+    assert asyncio.run(scenario()) == (b'one', b'two', b'three')